@@ -3,6 +3,7 @@ APP_NAME=FastAPI Web API (Production)
 APP_ENV=pro
 APP_PORT=8080
 DEBUG=false
+WORKERS=4
 
 # 数据库配置
 DB_HOST=127.0.0.1
@@ -19,6 +20,7 @@ REDIS_PORT=6379
 REDIS_PASSWORD=your-redis-password
 REDIS_DB=2
 REDIS_TIMEOUT=10
+REDIS_POOL_SIZE=50
 
 # JWT配置（生产环境请务必修改SECRET_KEY）
 SECRET_KEY=production-secret-key-must-be-changed-very-long-random-string
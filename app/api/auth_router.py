@@ -2,31 +2,51 @@
 认证相关路由：登录、刷新token、获取当前用户信息
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
+from fastapi import APIRouter
+from fastapi.responses import Response
 
+from app.api.deps import DB, CurrentUser
 from app.core.response import BaseResponse
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    get_current_active_user,
-    verify_password,
+    verify_password_async,
 )
 from app.core.redis_service import redis_service
-from app.core.config import settings
-from app.db.session import get_db
-from app.models.user_model import User
+from app.core.config import HOT
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth_schema import LoginRequest, TokenRefreshRequest, TokenResponse
 from app.schemas.user_schema import UserOut
 
 router = APIRouter(prefix="/auth", tags=["认证管理"])
 
+# /auth/me 输出缓存：user_id -> (updated_at, UserOut)，updated_at 变化或本进程更新用户后立即失效；
+# MySQL 的 DATETIME 只精确到秒，同一秒内的多次更新及其他进程的更新依赖 TTL 兜底
+_ME_CACHE: TTLCache = TTLCache(maxsize=10000, ttl=30)
 
-@router.post("/logout", summary="用户登出")
+
+def invalidate_me_cache(user_id: int) -> None:
+    """
+    清除指定用户的 /auth/me 输出缓存（用户更新或删除后调用）
+
+    Args:
+        user_id: 用户ID
+    """
+    _ME_CACHE.pop(user_id, None)
+
+
+# TokenResponse 中的固定字段
+_TOKEN_TEMPLATE = {"token_type": "bearer", "expires_in": HOT.access_ttl_seconds}
+
+# 固定内容的响应体，启动时预先序列化
+_LOGOUT_OK = BaseResponse.success_bytes(message="登出成功")
+
+
+@router.post("/logout", response_model=BaseResponse[dict], summary="用户登出")
 async def logout(
-    current_user: User = Depends(get_current_active_user),
-) -> BaseResponse[dict]:
+    current_user: CurrentUser,
+) -> Response:
     """
     用户登出，撤销当前用户的所有token
 
@@ -35,15 +55,15 @@ async def logout(
     - 实现单点登录，用户在任意位置登出，所有设备都会失效
     """
     # 撤销用户的所有token
-    redis_service.revoke_all_user_tokens(current_user.user_id)
+    await redis_service.revoke_all_user_tokens(current_user.user_id)
 
-    return BaseResponse.success_res(message="登出成功")
+    return Response(content=_LOGOUT_OK, media_type="application/json")
 
 
 @router.post("/login", response_model=BaseResponse[TokenResponse], summary="用户登录")
 async def login(
     request: LoginRequest,
-    db: AsyncSession = Depends(get_db),
+    db: DB,
 ) -> BaseResponse[TokenResponse]:
     """
     用户登录，返回访问token和刷新token
@@ -62,37 +82,33 @@ async def login(
     repo = UserRepository(db)
 
     # 查找用户
-    user = await repo.get_by_user_name(request.username)
+    user = await repo.get_by_user_name_cached(request.username)
     if not user:
         return BaseResponse.fail_res(message="用户名或密码错误")
 
     # 验证密码
-    if not verify_password(request.password, user.hashed_password):
+    if not await verify_password_async(request.password, user.hashed_password):
         return BaseResponse.fail_res(message="用户名或密码错误")
 
     if not user.is_active:
         return BaseResponse.fail_res(message="用户已被禁用")
 
-    # 实现单点登录：撤销用户之前的所有token
-    redis_service.revoke_all_user_tokens(user.user_id)
-
     # 生成新的token
     access_token = create_access_token(data={"sub": str(user.user_id)})
     refresh_token = create_refresh_token(data={"sub": str(user.user_id)})
 
-    # 将token存储到Redis
-    redis_service.store_access_token(
+    # 实现单点登录：撤销用户之前的所有token，并将新token存储到Redis（单次事务）
+    await redis_service.login_atomic(
         user_id=user.user_id,
         access_token=access_token,
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        access_ttl=HOT.access_ttl_seconds,
+        refresh_token=refresh_token,
+        refresh_ttl=HOT.refresh_ttl_seconds,
     )
-    redis_service.store_refresh_token(user_id=user.user_id, refresh_token=refresh_token)
 
-    token_response = TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    # token由服务端生成，字段可信，跳过校验直接构造
+    token_response = TokenResponse.model_construct(
+        access_token=access_token, refresh_token=refresh_token, **_TOKEN_TEMPLATE
     )
 
     return BaseResponse.success_res(data=token_response, message="登录成功")
@@ -114,10 +130,8 @@ async def refresh_token(
 
     说明：会从Redis中验证刷新token的有效性
     """
-    from app.core.security import decode_token
-
     # 从Redis中验证刷新token
-    user_id = redis_service.get_user_id_by_refresh_token(request.refresh_token)
+    user_id = await redis_service.get_user_id_by_refresh_token(request.refresh_token)
     if user_id is None:
         return BaseResponse.fail_res(message="刷新token已过期或无效")
 
@@ -125,17 +139,16 @@ async def refresh_token(
     access_token = create_access_token(data={"sub": str(user_id)})
 
     # 将新的访问token存储到Redis
-    redis_service.store_access_token(
+    await redis_service.store_access_token(
         user_id=user_id,
         access_token=access_token,
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        expires_in=HOT.access_ttl_seconds,
     )
 
-    token_response = TokenResponse(
+    token_response = TokenResponse.model_construct(
         access_token=access_token,
         refresh_token=request.refresh_token,  # 刷新token不变
-        token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        **_TOKEN_TEMPLATE,
     )
 
     return BaseResponse.success_res(data=token_response, message="刷新成功")
@@ -143,7 +156,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=BaseResponse[UserOut], summary="获取当前用户信息")
 async def get_current_user_info(
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser,
 ) -> BaseResponse[UserOut]:
     """
     获取当前登录用户信息
@@ -153,7 +166,11 @@ async def get_current_user_info(
     Authorization: Bearer <access_token>
     ```
     """
-
-    user_out = UserOut.model_validate(current_user)
+    cached = _ME_CACHE.get(current_user.user_id)
+    if cached is not None and cached[0] == current_user.updated_at:
+        user_out = cached[1]
+    else:
+        user_out = UserOut.model_validate(current_user)
+        _ME_CACHE[current_user.user_id] = (current_user.updated_at, user_out)
 
     return BaseResponse.success_res(data=user_out, message="获取用户信息成功")
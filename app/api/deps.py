@@ -0,0 +1,18 @@
+"""
+路由通用依赖：数据库会话与当前登录用户的类型别名
+"""
+
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_current_active_user
+from app.db.session import get_db
+from app.models.user_model import User
+
+# 数据库会话
+DB = Annotated[AsyncSession, Depends(get_db)]
+
+# 当前登录的活跃用户
+CurrentUser = Annotated[User, Depends(get_current_active_user)]
@@ -1,7 +1,8 @@
-from datetime import datetime
+import time
 
+import orjson
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -10,6 +11,22 @@ from app.db.session import check_db_connection, get_db
 
 router = APIRouter(prefix="/health", tags=["系统监控"])
 
+# 数据库连接检查成功结果的缓存截止时间（monotonic秒）
+_DB_OK_UNTIL: float = 0.0
+_DB_OK_TTL = 3.0
+
+# 按秒缓存的时间戳字符串：(秒, 格式化结果)
+_LAST_TS: tuple[int, str] = (0, "")
+
+
+def _now_str() -> str:
+    """获取当前时间字符串（同一秒内复用格式化结果）"""
+    global _LAST_TS
+    sec = int(time.time())
+    if sec != _LAST_TS[0]:
+        _LAST_TS = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
+    return _LAST_TS[1]
+
 
 @router.get("", summary="系统健康检查")
 async def health_check():
@@ -19,22 +36,28 @@ async def health_check():
     """
     health_status = {
         "status": "healthy",
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": _now_str(),
         "app_name": settings.APP_NAME,
         "app_version": "1.0.0",
         "environment": settings.APP_ENV,
         "checks": {"database": "connected", "app": "running"},
     }
 
-    # 检查数据库连接
-    try:
-        await check_db_connection()
-        health_status["checks"]["database"] = "connected"
-    except Exception as e:
-        health_status["status"] = "unhealthy"
-        health_status["checks"]["database"] = f"disconnected: {str(e)}"
+    # 检查数据库连接（成功结果缓存数秒，避免探针频繁访问数据库）
+    global _DB_OK_UNTIL
+    if time.monotonic() >= _DB_OK_UNTIL:
+        if await check_db_connection():
+            _DB_OK_UNTIL = time.monotonic() + _DB_OK_TTL
+        else:
+            _DB_OK_UNTIL = 0.0
+            health_status["status"] = "unhealthy"
+            health_status["checks"]["database"] = "disconnected"
 
     # 根据状态返回不同的HTTP状态码
     status_code = 200 if health_status["status"] == "healthy" else 503
 
-    return JSONResponse(content=health_status, status_code=status_code)
+    return Response(
+        content=orjson.dumps(health_status),
+        status_code=status_code,
+        media_type="application/json",
+    )
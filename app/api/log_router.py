@@ -1,21 +1,39 @@
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Body, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.response import BaseResponse, PageData, PageResponse
-from app.db.session import get_db
+from app.api.deps import DB
+from app.core.response import (
+    BaseResponse,
+    CursorPageData,
+    CursorPageResponse,
+    ORJSONResponse,
+    PageData,
+    PageResponse,
+)
 from app.schemas.base_schema import PaginationParams
 from app.schemas.log_schema import LogBatchDelete, LogCleanupByTime, SysLogOut
 from app.services.log_service import SysLogService
 
 router = APIRouter(prefix="/sys-logs", tags=["日志管理"])
 
+# 日志列表过滤字段（顺序与 list_logs 的查询参数一一对应）
+_FILTER_KEYS = (
+    "request_url",
+    "request_method",
+    "visit_module",
+    "operation_status",
+    "client_ip",
+    "start_time",
+    "end_time",
+)
+
 
 @router.get("/list", response_model=PageResponse[SysLogOut], summary="获取日志列表")
 async def list_logs(
-    pagination: PaginationParams = Depends(),
+    pagination: Annotated[PaginationParams, Depends()],
+    db: DB,
     requestUrl: Optional[str] = Query(None, description="请求URL筛选"),
     requestMethod: Optional[str] = Query(None, description="请求方法筛选"),
     visitModule: Optional[str] = Query(None, description="访问模块筛选"),
@@ -23,38 +41,72 @@ async def list_logs(
     clientIp: Optional[str] = Query(None, description="客户端IP筛选"),
     startTime: Optional[str] = Query(None, description="开始时间(YYYY-MM-DD HH:mm:ss)"),
     endTime: Optional[str] = Query(None, description="结束时间(YYYY-MM-DD HH:mm:ss)"),
-    db: AsyncSession = Depends(get_db),
-) -> PageResponse[SysLogOut]:
+) -> ORJSONResponse:
     """
     获取日志列表，参数由 FastAPI 自动验证
+
+    分页结果直接序列化为JSON返回，跳过 response_model 的二次校验与编码
     """
     service = SysLogService(db)
 
-    # 构建过滤条件
-    filters = {}
-    if requestUrl:
-        filters["request_url"] = requestUrl
-    if requestMethod:
-        filters["request_method"] = requestMethod
-    if visitModule:
-        filters["visit_module"] = visitModule
-    if operationStatus:
-        filters["operation_status"] = operationStatus
-    if clientIp:
-        filters["client_ip"] = clientIp
-    if startTime:
-        filters["start_time"] = startTime
-    if endTime:
-        filters["end_time"] = endTime
-
-    data = await service.get_logs(pagination.page, pagination.page_size, **filters)
+    # 构建过滤条件（只保留有值的条件）
+    filters = {
+        key: value
+        for key, value in zip(
+            _FILTER_KEYS,
+            (requestUrl, requestMethod, visitModule, operationStatus, clientIp, startTime, endTime),
+        )
+        if value
+    }
+
+    data = await service.get_logs(
+        pagination.page, pagination.page_size, pagination.with_count, **filters
+    )
     page_data = PageData[SysLogOut](**data)
-    return PageResponse(success=True, data=page_data, message="获取成功")
+    return PageResponse(success=True, data=page_data, message="获取成功").to_orjson_response()
+
+
+@router.get(
+    "/cursor-list",
+    response_model=CursorPageResponse[SysLogOut],
+    summary="游标分页获取日志列表",
+)
+async def list_logs_by_cursor(
+    db: DB,
+    cursor: Optional[str] = Query(None, description="上一页返回的 nextCursor，为空时获取第一页"),
+    pageSize: int = Query(10, description="每页数量"),
+    requestUrl: Optional[str] = Query(None, description="请求URL筛选"),
+    requestMethod: Optional[str] = Query(None, description="请求方法筛选"),
+    visitModule: Optional[str] = Query(None, description="访问模块筛选"),
+    operationStatus: Optional[str] = Query(None, description="操作状态筛选"),
+    clientIp: Optional[str] = Query(None, description="客户端IP筛选"),
+    startTime: Optional[str] = Query(None, description="开始时间(YYYY-MM-DD HH:mm:ss)"),
+    endTime: Optional[str] = Query(None, description="结束时间(YYYY-MM-DD HH:mm:ss)"),
+) -> ORJSONResponse:
+    """
+    游标分页获取日志列表，适合连续向后翻页（深翻页耗时不随页数增长）；需要跳页时使用 /list
+    """
+    service = SysLogService(db)
+
+    filters = {
+        key: value
+        for key, value in zip(
+            _FILTER_KEYS,
+            (requestUrl, requestMethod, visitModule, operationStatus, clientIp, startTime, endTime),
+        )
+        if value
+    }
+
+    data = await service.get_logs_by_cursor(cursor, pageSize, **filters)
+    page_data = CursorPageData[SysLogOut](**data)
+    return CursorPageResponse(
+        success=True, data=page_data, message="获取成功"
+    ).to_orjson_response()
 
 
 @router.delete("/batch", response_model=BaseResponse[int], summary="批量删除日志")
 async def batch_delete_logs(
-    obj_in: LogBatchDelete = Body(...), db: AsyncSession = Depends(get_db)
+    obj_in: Annotated[LogBatchDelete, Body()], db: DB
 ) -> BaseResponse[int]:
     """
     批量删除指定ID的日志记录
@@ -68,12 +120,11 @@ async def batch_delete_logs(
 
 @router.post("/cleanup", response_model=BaseResponse[int], summary="清理日志")
 async def cleanup_logs(
-    obj_in: LogCleanupByTime = Body(...), db: AsyncSession = Depends(get_db)
+    obj_in: Annotated[LogCleanupByTime, Body()], db: DB
 ) -> BaseResponse[int]:
     """
     清理指定时间范围内的日志
     """
-    print(obj_in)
     service = SysLogService(db)
     deleted_count = await service.cleanup_logs(obj_in)
     return BaseResponse.success_res(
@@ -82,7 +133,7 @@ async def cleanup_logs(
 
 
 @router.delete("/clear-all", response_model=BaseResponse[int], summary="清空所有日志")
-async def clear_all_logs(db: AsyncSession = Depends(get_db)) -> BaseResponse[int]:
+async def clear_all_logs(db: DB) -> BaseResponse[int]:
     """
     清空所有日志记录（请谨慎使用）
     """
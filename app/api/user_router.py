@@ -1,14 +1,26 @@
-from typing import Any
+from typing import Annotated, Any, Optional
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi_cache import FastAPICache
+from fastapi.responses import Response
 from fastapi_cache.decorator import cache
 
-from app.core.response import BaseResponse, PageData, PageResponse
-from app.core.security import get_current_active_user
-from app.core.permissions import require_self_or_admin, require_admin
-from app.db.session import get_db
+from app.api.auth_router import invalidate_me_cache
+from app.api.deps import DB, CurrentUser
+from app.core.cache_keys import (
+    USER_DETAIL_NAMESPACE,
+    USERS_LIST_NAMESPACE,
+    invalidate_user_detail,
+    invalidate_users_list,
+    user_detail_key_builder,
+    users_list_key_builder,
+)
+from app.core.response import (
+    BaseResponse,
+    CursorPageData,
+    CursorPageResponse,
+    PageData,
+    PageResponse,
+)
 from app.models.user_model import User
 from app.schemas.base_schema import PaginationParams
 from app.schemas.user_schema import UserCreate, UserOut, UserUpdate
@@ -16,49 +28,84 @@ from app.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["用户管理"])
 
+# 固定内容的响应体，启动时预先序列化
+_DELETE_OK = BaseResponse.success_bytes(message="用户删除成功")
+
 
 @router.post("/add", response_model=BaseResponse[UserOut], summary="新增用户")
 async def create_user(
     obj_in: UserCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: DB,
+    current_user: CurrentUser,
 ) -> BaseResponse[UserOut]:
     service = UserService(db)
     user = await service.create_user(obj_in)
     # 使用权限控制方法创建用户输出对象
     user_out = UserOut.from_user_with_permission(user, current_user)
-    # 新增用户后，清空用户列表缓存
-    await FastAPICache.clear(namespace="users_list")
+    # 新增用户后，使用户列表缓存失效
+    await invalidate_users_list()
     return BaseResponse.success_res(data=user_out)
 
 
 @router.get("/list", response_model=PageResponse[UserOut], summary="获取用户列表")
+@cache(namespace=USERS_LIST_NAMESPACE, expire=300, key_builder=users_list_key_builder)
 async def list_users(
-    pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    pagination: Annotated[PaginationParams, Depends()],
+    db: DB,
+    current_user: CurrentUser,
 ) -> PageResponse[UserOut]:
     """
     获取用户列表，参数由 FastAPI 自动验证
     """
     service = UserService(db)
     # 传递current_user参数进行权限过滤
-    data = await service.list_users(pagination.page, pagination.page_size, current_user)
-    # 使用权限控制方法创建用户输出列表
-    user_out_list = [UserOut.from_user_with_permission(user, current_user) for user in data["records"]]
-    data["records"] = user_out_list
+    data = await service.list_users(
+        pagination.page, pagination.page_size, current_user, pagination.with_count
+    )
+    data["records"] = _to_user_out_list(data["records"], current_user)
     page_data = PageData[UserOut](**data)
     return PageResponse(success=True, data=page_data, message="获取成功")
 
 
+@router.get(
+    "/cursor-list", response_model=CursorPageResponse[UserOut], summary="游标分页获取用户列表"
+)
+async def list_users_by_cursor(
+    db: DB,
+    current_user: CurrentUser,
+    cursor: Optional[str] = Query(None, description="上一页返回的 nextCursor，为空时获取第一页"),
+    pageSize: int = Query(10, description="每页数量"),
+) -> CursorPageResponse[UserOut]:
+    """
+    游标分页获取用户列表，适合连续向后翻页（深翻页耗时不随页数增长）；需要跳页时使用 /list
+    """
+    service = UserService(db)
+    data = await service.list_users_by_cursor(cursor, pageSize, current_user)
+    data["records"] = _to_user_out_list(data["records"], current_user)
+    page_data = CursorPageData[UserOut](**data)
+    return CursorPageResponse(success=True, data=page_data, message="获取成功")
+
+
+def _to_user_out_list(records: list, current_user: User) -> list[UserOut]:
+    """
+    将用户行转换为输出对象
+
+    权限判断提到循环外：管理员走完整输出，普通用户走屏蔽输出
+    """
+    if current_user.user_type == 1:
+        return list(map(UserOut.from_user_fast, records))
+    viewer_id = current_user.user_id
+    return [UserOut.from_user_masked(user, viewer_id) for user in records]
+
+
 @router.get(
     "/detail/{user_id}", response_model=BaseResponse[UserOut], summary="获取用户详情"
 )
-@cache(namespace="user_detail", expire=300)
+@cache(namespace=USER_DETAIL_NAMESPACE, expire=300, key_builder=user_detail_key_builder)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: DB,
+    current_user: CurrentUser,
 ) -> BaseResponse[UserOut]:
     service = UserService(db)
     
@@ -78,8 +125,8 @@ async def get_user(
 async def update_user(
     user_id: int,
     obj_in: UserUpdate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: DB,
+    current_user: CurrentUser,
 ) -> BaseResponse[UserOut]:
     service = UserService(db)
     
@@ -90,9 +137,10 @@ async def update_user(
     user = await service.update_user(user_id, obj_in)
     # 使用权限控制方法创建用户输出对象
     user_out = UserOut.from_user_with_permission(user, current_user)
-    # 更新用户信息后，清空相关缓存
-    await FastAPICache.clear(namespace="user_detail")
-    await FastAPICache.clear(namespace="users_list")
+    # 更新用户信息后，定向清除相关缓存
+    invalidate_me_cache(user_id)
+    await invalidate_user_detail(user_id)
+    await invalidate_users_list()
     return BaseResponse.success_res(data=user_out)
 
 
@@ -101,17 +149,18 @@ async def update_user(
 )
 async def delete_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-) -> BaseResponse[Any]:
+    db: DB,
+    current_user: CurrentUser,
+) -> Response:
     service = UserService(db)
     
     # 检查删除权限
     if not await service.can_delete_user(current_user, user_id):
-        return BaseResponse.fail_res(message="没有权限删除该用户")
+        return BaseResponse.fail_res(message="没有权限删除该用户").to_orjson_response()
         
     await service.delete_user(user_id)
-    # 删除用户后，清空相关缓存
-    await FastAPICache.clear(namespace="user_detail")
-    await FastAPICache.clear(namespace="users_list")
-    return BaseResponse.success_res(message="用户删除成功")
+    # 删除用户后，定向清除相关缓存
+    invalidate_me_cache(user_id)
+    await invalidate_user_detail(user_id)
+    await invalidate_users_list()
+    return Response(content=_DELETE_OK, media_type="application/json")
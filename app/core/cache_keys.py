@@ -0,0 +1,105 @@
+"""
+接口缓存key管理：确定性的缓存key构造与定向失效
+
+- 用户详情：{prefix}:user_detail:{user_id}:{viewer}
+- 用户列表：{prefix}:users_list:v{version}:{page}:{page_size}:{with_count}:{viewer}
+
+viewer 为 admin（管理员）或查看者自身的用户ID，保证不同权限的输出互不串用；
+列表通过版本号失效，旧版本条目依赖TTL自然过期，无需 KEYS/SCAN
+"""
+
+from typing import Any, Callable, Optional
+
+from fastapi_cache import FastAPICache
+from redis.exceptions import RedisError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.logger import get_logger
+from app.models.user_model import User
+
+logger = get_logger(__name__)
+
+USER_DETAIL_NAMESPACE = "user_detail"
+USERS_LIST_NAMESPACE = "users_list"
+USERS_LIST_VERSION_KEY = "users_list_version"
+
+
+def _viewer_scope(current_user: User) -> str:
+    """根据查看者权限生成缓存作用域"""
+    return "admin" if current_user.user_type == 1 else str(current_user.user_id)
+
+
+def user_detail_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: tuple = (),
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    用户详情缓存key
+    """
+    kwargs = kwargs or {}
+    return f"{namespace}:{kwargs['user_id']}:{_viewer_scope(kwargs['current_user'])}"
+
+
+async def users_list_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: tuple = (),
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    用户列表缓存key（包含当前列表版本号）
+    """
+    kwargs = kwargs or {}
+    pagination = kwargs["pagination"]
+    version = await _get_users_list_version()
+    return (
+        f"{namespace}:v{version}:{pagination.page}:{pagination.page_size}:"
+        f"{int(pagination.with_count)}:{_viewer_scope(kwargs['current_user'])}"
+    )
+
+
+async def _get_users_list_version() -> str:
+    """读取用户列表缓存版本号，Redis异常时返回0（随后的缓存读写同样会降级）"""
+    try:
+        version = await FastAPICache.get_backend().redis.get(USERS_LIST_VERSION_KEY)
+    except RedisError as e:
+        logger.warning("读取用户列表缓存版本失败", error=str(e))
+        return "0"
+    return version or "0"
+
+
+async def invalidate_users_list() -> None:
+    """
+    使用户列表缓存失效（递增版本号）
+    """
+    try:
+        await FastAPICache.get_backend().redis.incr(USERS_LIST_VERSION_KEY)
+    except RedisError as e:
+        logger.warning("更新用户列表缓存版本失败", error=str(e))
+
+
+async def invalidate_user_detail(user_id: int) -> None:
+    """
+    删除指定用户的详情缓存
+
+    能成功读取某用户详情的只有管理员和该用户本人，因此只需删除这两个key
+
+    Args:
+        user_id: 用户ID
+    """
+    prefix = f"{FastAPICache.get_prefix()}:{USER_DETAIL_NAMESPACE}:{user_id}"
+    try:
+        await FastAPICache.get_backend().redis.delete(
+            f"{prefix}:admin", f"{prefix}:{user_id}"
+        )
+    except RedisError as e:
+        logger.warning("删除用户详情缓存失败", user_id=user_id, error=str(e))
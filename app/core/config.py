@@ -1,11 +1,15 @@
 import os
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# 获取项目根目录
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
+# 获取项目根目录（可通过 APP_BASE_DIR 指定；abspath 为纯字符串运算，不触发文件系统调用）
+BASE_DIR = Path(
+    os.environ.get("APP_BASE_DIR")
+    or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)
 
 
 class Settings(BaseSettings):
@@ -18,6 +22,7 @@ class Settings(BaseSettings):
     APP_ENV: str = "local"  # 环境变量
     APP_PORT: int = 8000  # 应用端口
     DEBUG: bool = True  # 是否开启调试模式
+    WORKERS: int = 1  # 工作进程数（调试模式下固定为1）
 
     # 数据库配置
     DB_HOST: str = "127.0.0.1"  # 数据库地址
@@ -32,7 +37,9 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20  # 连接池大小
     DB_MAX_OVERFLOW: int = 40  # 连接池最大溢出量
     DB_POOL_TIMEOUT: int = 30  # 连接池超时时间
-    DB_POOL_RECYCLE: int = 3600  # 连接池重用时间
+    DB_POOL_RECYCLE: int = 1800  # 连接池重用时间（低于负载均衡/代理的空闲断开时间）
+    # 借出连接前先 ping（每次借出多一次往返）；默认关闭，由 pool_recycle 与驱动开启的 TCP keepalive 处理失效连接
+    DB_POOL_PRE_PING: bool = False
 
     # JWT配置（必须从环境变量读取，生产环境必须修改SECRET_KEY）
     SECRET_KEY: str  # JWT密钥，必须通过环境变量配置
@@ -46,6 +53,7 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str = ""
     REDIS_DB: int = 0
     REDIS_TIMEOUT: int = 10
+    REDIS_POOL_SIZE: int = 50  # Redis连接池最大连接数
 
     # 日志配置
     LOG_LEVEL: str = "INFO"  # 日志级别
@@ -95,7 +103,7 @@ class Settings(BaseSettings):
     # 自动识别环境并加载对应的 .env 文件
     # 优先使用 local 环境，如果不存在则使用 dev
     model_config = SettingsConfigDict(
-        env_file=os.path.join(BASE_DIR, f".env.{os.getenv('APP_ENV', 'local')}"),
+        env_file=f"{BASE_DIR}{os.sep}.env.{os.getenv('APP_ENV', 'local')}",
         env_file_encoding="utf-8",
         extra="ignore",
     )
@@ -127,6 +135,28 @@ def get_settings():
 settings = get_settings()
 
 
+@dataclass(slots=True, frozen=True)
+class _Hot:
+    """
+    热路径常量（启动时预计算，避免每次请求访问 pydantic 配置对象并重复计算）
+    """
+
+    access_ttl_seconds: int  # 访问token过期时间（秒）
+    refresh_ttl_seconds: int  # 刷新token过期时间（秒）
+    app_name: str  # 应用名称
+    secret_key: str  # JWT密钥
+    algorithm: str  # JWT算法
+
+
+HOT = _Hot(
+    access_ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    refresh_ttl_seconds=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+    app_name=settings.APP_NAME,
+    secret_key=settings.SECRET_KEY,
+    algorithm=settings.ALGORITHM,
+)
+
+
 def print_config_info():
     """
     打印基础配置信息 (启动时调用)
@@ -154,6 +184,7 @@ def print_config_info():
     print(f"   📈 最大溢出: {settings.DB_MAX_OVERFLOW}")
     print(f"   ⏱️  超时: {settings.DB_POOL_TIMEOUT}s")
     print(f"   🔄 回收时间: {settings.DB_POOL_RECYCLE}s")
+    print(f"   🏓 借出前ping: {'启用' if settings.DB_POOL_PRE_PING else '禁用'}")
 
     # 数据库初始化状态
     print(f"📋 数据库初始化: {'启用' if settings.DB_INIT else '禁用'}")
@@ -1,8 +1,12 @@
-from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.core.response import BaseResponse
+from app.core.logger import get_logger
+from app.core.response import ORJSONResponse
+
+logger = get_logger(__name__)
 
 
 class AppError(Exception):
@@ -15,111 +19,142 @@ class AppError(Exception):
         self.code = code
 
 
+_STATUS_MESSAGES: dict[int, str] = {
+    # 3xx 重定向
+    301: "资源已永久移动",
+    302: "资源已临时移动",
+    304: "资源未修改",
+    # 4xx 客户端错误
+    400: "请求参数错误",
+    401: "未授权访问，请先登录",
+    403: "权限不足，无法访问该资源",
+    404: "请求的资源不存在",
+    405: "请求方法不被允许",
+    408: "请求超时",
+    409: "资源冲突",
+    410: "资源已永久删除",
+    413: "请求实体过大",
+    414: "请求URI过长",
+    415: "不支持的媒体类型",
+    422: "请求参数验证失败",
+    429: "请求过于频繁，请稍后再试",
+    # 5xx 服务器错误
+    500: "服务器内部错误",
+    502: "网关错误",
+    503: "服务暂不可用",
+    504: "网关超时",
+}
+
+def _fail(message: str) -> dict:
+    """
+    构造失败响应体（结构固定，跳过 BaseResponse 模型构造与 model_dump）
+    """
+    return {"success": False, "data": None, "message": message}
+
+
+# 500 兜底响应体，启动时预先序列化
+INTERNAL_ERROR_BODY = orjson.dumps(_fail(_STATUS_MESSAGES[500]))
+
+
 def get_http_status_message(status_code: int, detail: str = "") -> str:
     """
     获取HTTP状态码对应的错误消息
     """
-    status_messages = {
-        # 3xx 重定向
-        301: "资源已永久移动",
-        302: "资源已临时移动",
-        304: "资源未修改",
-        # 4xx 客户端错误
-        400: "请求参数错误",
-        401: "未授权访问，请先登录",
-        403: "权限不足，无法访问该资源",
-        404: "请求的资源不存在",
-        405: "请求方法不被允许",
-        408: "请求超时",
-        409: "资源冲突",
-        410: "资源已永久删除",
-        413: "请求实体过大",
-        414: "请求URI过长",
-        415: "不支持的媒体类型",
-        422: "请求参数验证失败",
-        429: "请求过于频繁，请稍后再试",
-        # 5xx 服务器错误
-        500: "服务器内部错误",
-        502: "网关错误",
-        503: "服务暂不可用",
-        504: "网关超时",
-    }
-
-    default_message = status_messages.get(status_code, f"HTTP {status_code} 错误")
+    default_message = _STATUS_MESSAGES.get(status_code, f"HTTP {status_code} 错误")
 
     if detail:
         return f"{default_message}: {detail}"
     return default_message
 
 
-def handle_starlette_exception(exc: StarletteHTTPException) -> JSONResponse:
+def handle_starlette_exception(exc: StarletteHTTPException) -> Response:
     """
     处理Starlette HTTP异常
     """
     status_code = exc.status_code
+    # 对于重定向类状态码（3xx），保持原始状态码；其他错误状态码统一返回200，便于前端处理
+    response_status = status_code if 300 <= status_code < 400 else status.HTTP_200_OK
+
     message = get_http_status_message(status_code, exc.detail or "")
+    return ORJSONResponse(
+        status_code=response_status,
+        content=_fail(message),
+    )
+
 
-    # 对于重定向类状态码（3xx），保持原始状态码
-    if 300 <= status_code < 400:
-        return JSONResponse(
-            status_code=status_code,
-            content=BaseResponse.fail_res(message=message).model_dump(),
-        )
-    else:
-        # 其他错误状态码统一返回200，便于前端处理
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content=BaseResponse.fail_res(message=message).model_dump(),
-        )
+# pydantic 自定义校验器抛出 ValueError 时附加的消息前缀
+_VALUE_ERROR_PREFIX = "Value error, "
+_DEFAULT_VALIDATION_MSG = "参数验证失败"
 
 
-def handle_validation_exception(exc) -> JSONResponse:
+def handle_validation_exception(exc) -> ORJSONResponse:
     """
     处理Pydantic验证异常
     """
     errors = getattr(exc, "errors")()
     first_error = errors[0] if errors else {}
 
-    msg = first_error.get("msg", "参数验证失败")
-    if "Value error, " in msg:
-        msg = msg.replace("Value error, ", "")
+    msg = (first_error.get("msg") or _DEFAULT_VALIDATION_MSG).removeprefix(_VALUE_ERROR_PREFIX)
+    field = ".".join(str(l) for l in first_error.get("loc", ()) if l != "body")
 
-    field = ".".join([str(l) for l in first_error.get("loc", []) if l != "body"])
-
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=BaseResponse.fail_res(
-            message=f"【{field}】参数错误: {msg}"
-        ).model_dump(),
+        content=_fail(f"【{field}】参数错误: {msg}"),
+    )
+
+
+def _handle_app_error(exc: AppError) -> ORJSONResponse:
+    """
+    处理业务逻辑异常
+    """
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=_fail(exc.message),
     )
 
 
-def global_exception_handler(_request: Request, exc: Exception):
+def _handle_http_exception(exc: HTTPException) -> ORJSONResponse:
+    """
+    处理 FastAPI 自带的HTTP异常
+    """
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content=_fail(exc.detail),
+    )
+
+
+# 异常类型 -> 处理函数（按精确类型查找，子类回退到 isinstance 判断）
+_HANDLERS = {
+    AppError: _handle_app_error,
+    HTTPException: _handle_http_exception,
+    StarletteHTTPException: handle_starlette_exception,
+    RequestValidationError: handle_validation_exception,
+}
+
+
+async def global_exception_handler(_request: Request, exc: Exception):
     """
     全局异常捕获
     """
+    handler = _HANDLERS.get(type(exc))
+    if handler is not None:
+        return handler(exc)
+
+    # 子类异常回退
     if isinstance(exc, AppError):
-        # 业务逻辑异常
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content=BaseResponse.fail_res(message=exc.message).model_dump(),
-        )
-    elif isinstance(exc, HTTPException):
-        # FastAPI 自带异常
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=BaseResponse.fail_res(message=exc.detail).model_dump(),
-        )
-    elif isinstance(exc, StarletteHTTPException):
-        # Starlette HTTP 异常（包括301、401、403、404、500等）
+        return _handle_app_error(exc)
+    if isinstance(exc, HTTPException):
+        return _handle_http_exception(exc)
+    if isinstance(exc, StarletteHTTPException):
         return handle_starlette_exception(exc)
-    elif hasattr(exc, "errors"):
-        # Pydantic 验证异常 (RequestValidationError)
+    if hasattr(exc, "errors"):
+        # Pydantic 验证异常
         return handle_validation_exception(exc)
-    else:
-        # 系统未知异常
-        print(f"系统异常: {str(exc)}")
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content=BaseResponse.fail_res(message="服务器内部错误").model_dump(),
-        )
+
+    # 系统未知异常：始终记录完整堆栈，便于排查 500 错误
+    logger.exception("系统异常", err=str(exc), err_type=type(exc).__name__, exc_info=exc)
+    return Response(
+        content=INTERNAL_ERROR_BODY,
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        media_type="application/json",
+    )
@@ -1,38 +1,117 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
+import orjson
 import structlog
 
 from app.core.config import settings
 
 
+def _orjson_renderer(_logger, _method_name, event_dict) -> bytes:
+    """使用 orjson 将日志事件渲染为JSON字节（配合 BytesLoggerFactory 直接写出）"""
+    return orjson.dumps(event_dict, default=str)
+
+
+# 日志队列：请求路径上只做入队，由后台线程统一写出
+_LOG_QUEUE: queue.Queue = queue.Queue(maxsize=10000)
+_listener: Optional[QueueListener] = None
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """队列已满时直接丢弃日志，避免阻塞或在请求路径上打印异常"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class _QueueBytesFile:
+    """供 structlog BytesLogger 使用的类文件对象：写入即入队"""
+
+    def write(self, data: bytes) -> None:
+        try:
+            _LOG_QUEUE.put_nowait(data)
+        except queue.Full:
+            pass
+
+    def flush(self) -> None:
+        pass
+
+
+class _StdoutQueueListener(QueueListener):
+    """
+    后台日志写出线程
+
+    队列中既有标准 logging 的 LogRecord，也有 structlog 已渲染好的字节；
+    字节直接写入 stdout 缓冲区，队列清空时再统一 flush，实现批量写出
+    """
+
+    def __init__(self, log_queue: queue.Queue, handler: logging.Handler):
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self._stream = sys.stdout.buffer
+
+    def handle(self, record) -> None:
+        if isinstance(record, bytes):
+            self._stream.write(record)
+        else:
+            super().handle(record)
+        if self.queue.empty():
+            self._stream.flush()
+            sys.stdout.flush()
+
+
+def _start_listener() -> None:
+    """启动后台日志线程（进程内只启动一次，退出时自动刷新）"""
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _listener = _StdoutQueueListener(_LOG_QUEUE, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
 def setup_structlog():
     """
     配置结构化日志
+
+    structlog 日志不再经过标准 logging：级别过滤由 make_filtering_bound_logger 完成，
+    orjson 渲染后由 BytesLogger 写入日志队列；标准 logging 通过 QueueHandler 写入同一队列，
+    实际 I/O 由后台线程完成
     """
+    _start_listener()
+
+    # 项目只使用关键字参数风格记录日志且不传 stack_info / bytes 字段，
+    # 因此不挂 StackInfoRenderer、UnicodeDecoder；format_exc_info 仅在携带 exc_info 时工作
     processors = [
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S%f"),
-        structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(ensure_ascii=False),
+        _orjson_renderer,
     ]
 
     structlog.configure(
         processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(
+            getattr(logging, settings.LOG_LEVEL, logging.INFO)
+        ),
         context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        logger_factory=structlog.BytesLoggerFactory(file=_QueueBytesFile()),
         cache_logger_on_first_use=True,
     )
 
-    # 配置标准 logging 作为 structlog 的底层
+    # 标准 logging 仍用于中间件及第三方库（uvicorn、SQLAlchemy 等）
     logging.basicConfig(
         format="%(message)s",
         level=getattr(logging, settings.LOG_LEVEL, logging.INFO),
+        handlers=[_DroppingQueueHandler(_LOG_QUEUE)],
         force=True,
     )
 
@@ -47,7 +126,7 @@ def get_logger(name: str = "app"):
     Returns:
         structlog logger实例
     """
-    return structlog.get_logger(name)
+    return structlog.get_logger().bind(logger=name)
 
 
 # 初始化日志配置
@@ -1,74 +1,84 @@
 """
-权限验证装饰器模块
+权限验证依赖模块
 """
 
-from functools import wraps
-from typing import Callable, Optional
+from fastapi import Depends
 
 from app.core.exceptions import AppError
+from app.core.security import get_current_active_user
 from app.models.user_model import User
 
 
-def require_admin(func: Callable) -> Callable:
+async def admin_required(current_user: User = Depends(get_current_active_user)) -> User:
     """
-    需要管理员权限的装饰器
+    需要管理员权限的依赖
     
     Args:
-        func: 被装饰的函数
+        current_user: 当前登录用户
         
     Returns:
-        装饰后的函数
+        User: 校验通过的当前用户
         
     Raises:
         AppError: 当用户不是管理员时抛出权限错误
     """
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        # 从kwargs中获取current_user参数
-        current_user: Optional[User] = kwargs.get('current_user')
-        
-        if not current_user:
-            raise AppError("用户未登录")
-            
-        if current_user.user_type != 1:
-            raise AppError("需要管理员权限")
-            
-        return await func(*args, **kwargs)
-    return wrapper
+    if current_user.user_type != 1:
+        raise AppError("需要管理员权限")
+    return current_user
 
 
-def require_self_or_admin(func: Callable) -> Callable:
+async def self_or_admin_required(
+    user_id: int, current_user: User = Depends(get_current_active_user)
+) -> User:
     """
-    需要本人或管理员权限的装饰器
+    需要本人或管理员权限的依赖（user_id 取自路径参数）
     
     Args:
-        func: 被装饰的函数
+        user_id: 目标用户ID
+        current_user: 当前登录用户
         
     Returns:
-        装饰后的函数
+        User: 校验通过的当前用户
         
     Raises:
         AppError: 当用户没有权限时抛出权限错误
     """
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        # 从kwargs中获取参数
-        current_user: Optional[User] = kwargs.get('current_user')
-        target_user_id = kwargs.get('user_id')
+    # 管理员允许操作；普通用户只能操作自己的资源
+    if current_user.user_type != 1 and current_user.user_id != user_id:
+        raise AppError("没有权限操作该用户")
+    return current_user
+
+
+def _check_delete(current_user: User, target_user: User) -> bool:
+    """普通用户删除权限检查"""
+    raise AppError("普通用户不能删除用户")
+
+
+def _check_view(current_user: User, target_user: User) -> bool:
+    """普通用户查看权限检查"""
+    if current_user.user_id != target_user.user_id:
+        raise AppError("没有权限查看该用户信息")
+    return True
+
+
+def _check_update(current_user: User, target_user: User) -> bool:
+    """普通用户更新权限检查"""
+    # 普通用户不能修改管理员用户
+    if target_user.user_type == 1:
+        raise AppError("没有权限修改管理员用户")
         
-        if not current_user:
-            raise AppError("用户未登录")
-            
-        # 如果是管理员，允许操作
-        if current_user.user_type == 1:
-            return await func(*args, **kwargs)
-            
-        # 如果是普通用户，只能操作自己的资源
-        if current_user.user_id != target_user_id:
-            raise AppError("没有权限操作该用户")
-            
-        return await func(*args, **kwargs)
-    return wrapper
+    # 只能修改自己的信息
+    if current_user.user_id != target_user.user_id:
+        raise AppError("没有权限修改该用户信息")
+    return True
+
+
+# 操作类型 -> 普通用户权限检查函数
+_OPS = {
+    "delete": _check_delete,
+    "view": _check_view,
+    "update": _check_update,
+}
 
 
 def can_operate_user(current_user: User, target_user: User, operation: str) -> bool:
@@ -94,22 +104,7 @@ def can_operate_user(current_user: User, target_user: User, operation: str) -> b
         return True
     
     # 普通用户的权限限制
-    if operation == 'delete':
-        raise AppError("普通用户不能删除用户")
-        
-    if operation == 'view':
-        if current_user.user_id != target_user.user_id:
-            raise AppError("没有权限查看该用户信息")
-        return True
-        
-    if operation == 'update':
-        # 普通用户不能修改管理员用户
-        if target_user.user_type == 1:
-            raise AppError("没有权限修改管理员用户")
-            
-        # 只能修改自己的信息
-        if current_user.user_id != target_user.user_id:
-            raise AppError("没有权限修改该用户信息")
-        return True
-        
-    return False
+    handler = _OPS.get(operation)
+    if handler is None:
+        return False
+    return handler(current_user, target_user)
@@ -1,11 +1,51 @@
 """
 Redis服务：管理JWT token存储和单点登录
 """
-import json
 from typing import Optional
 
-from redis import Redis
-from app.core.config import settings
+from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from app.core.config import HOT, settings
+
+# 模块级连接池：所有Redis客户端共享，避免每次请求新建连接
+_pool = ConnectionPool(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    password=settings.REDIS_PASSWORD or None,
+    max_connections=settings.REDIS_POOL_SIZE,
+    # 不做UTF-8解码：token相关的值只有用户ID，直接 int(bytes) 即可
+    decode_responses=False,
+    socket_timeout=settings.REDIS_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_TIMEOUT,
+)
+
+# 撤销用户所有access token：读取token列表、逐个删除、清空列表，在服务端一次完成
+# KEYS[1]: user_tokens:{user_id}  ARGV[1]: access token key前缀
+REVOKE_LUA = """
+local toks = redis.call('LRANGE', KEYS[1], 0, -1)
+for i = 1, #toks do
+    redis.call('DEL', ARGV[1] .. toks[i])
+end
+redis.call('DEL', KEYS[1])
+return #toks
+"""
+
+# 登录：撤销旧的access token并写入新的access/refresh token
+# KEYS[1]: user_tokens:{user_id}  KEYS[2]: 新access token key  KEYS[3]: 新refresh token key
+# ARGV: access token key前缀, user_id, access_token, access_ttl, refresh_ttl
+LOGIN_LUA = """
+local toks = redis.call('LRANGE', KEYS[1], 0, -1)
+for i = 1, #toks do
+    redis.call('DEL', ARGV[1] .. toks[i])
+end
+redis.call('DEL', KEYS[1])
+redis.call('SETEX', KEYS[2], ARGV[4], ARGV[2])
+redis.call('SETEX', KEYS[3], ARGV[5], ARGV[2])
+redis.call('LPUSH', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return #toks
+"""
 
 
 class RedisService:
@@ -14,22 +54,12 @@ class RedisService:
     """
     
     def __init__(self):
-        """初始化Redis连接"""
-        self._redis: Optional[Redis] = None
-    
-    def get_redis(self) -> Redis:
-        """获取Redis连接（懒加载）"""
-        if self._redis is None:
-            redis_url = f"redis://:{settings.REDIS_PASSWORD}@{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
-            self._redis = Redis.from_url(
-                redis_url,
-                decode_responses=True,
-                socket_timeout=settings.REDIS_TIMEOUT,
-                socket_connect_timeout=settings.REDIS_TIMEOUT,
-            )
-        return self._redis
+        """初始化Redis客户端（共享模块级连接池，连接在首次命令时才建立）并注册Lua脚本"""
+        self.redis: Redis = Redis(connection_pool=_pool)
+        self._revoke_script: AsyncScript = self.redis.register_script(REVOKE_LUA)
+        self._login_script: AsyncScript = self.redis.register_script(LOGIN_LUA)
     
-    def store_access_token(
+    async def store_access_token(
         self,
         user_id: int,
         access_token: str,
@@ -43,26 +73,23 @@ class RedisService:
             access_token: 访问token
             expires_in: 过期时间（秒）
         """
-        redis = self.get_redis()
-        
         # 生成token的key
         token_key = f"access_token:{access_token}"
         
-        # 存储token与用户的映射
-        redis.setex(
-            token_key,
-            expires_in,
-            str(user_id)
-        )
-        
-        # 将token添加到用户的token列表（用于单点登录）
         user_tokens_key = f"user_tokens:{user_id}"
-        redis.lpush(user_tokens_key, access_token)
-        # 设置过期时间为刷新token的过期时间（天转为秒）
-        refresh_expire = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
-        redis.expire(user_tokens_key, refresh_expire)
+        # 设置过期时间为刷新token的过期时间
+        refresh_expire = HOT.refresh_ttl_seconds
+        
+        # 三个写操作合并为一次往返
+        async with self.redis.pipeline() as pipe:
+            # 存储token与用户的映射
+            pipe.setex(token_key, expires_in, str(user_id))
+            # 将token添加到用户的token列表（用于单点登录）
+            pipe.lpush(user_tokens_key, access_token)
+            pipe.expire(user_tokens_key, refresh_expire)
+            await pipe.execute()
     
-    def store_refresh_token(
+    async def store_refresh_token(
         self,
         user_id: int,
         refresh_token: str
@@ -74,20 +101,18 @@ class RedisService:
             user_id: 用户ID
             refresh_token: 刷新token
         """
-        redis = self.get_redis()
-        
         # 生成token的key
         token_key = f"refresh_token:{refresh_token}"
         
         # 存储token与用户的映射
-        expires_in = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
-        redis.setex(
+        expires_in = HOT.refresh_ttl_seconds
+        await self.redis.setex(
             token_key,
             expires_in,
             str(user_id)
         )
     
-    def get_user_id_by_access_token(self, access_token: str) -> Optional[int]:
+    async def get_user_id_by_access_token(self, access_token: str) -> Optional[int]:
         """
         通过访问token获取用户ID
         
@@ -97,13 +122,12 @@ class RedisService:
         Returns:
             用户ID，如果token不存在返回None
         """
-        redis = self.get_redis()
         token_key = f"access_token:{access_token}"
-        user_id_str = redis.get(token_key)
+        user_id_raw = await self.redis.get(token_key)
         
-        return int(user_id_str) if user_id_str else None
+        return int(user_id_raw) if user_id_raw else None
     
-    def get_user_id_by_refresh_token(self, refresh_token: str) -> Optional[int]:
+    async def get_user_id_by_refresh_token(self, refresh_token: str) -> Optional[int]:
         """
         通过刷新token获取用户ID
         
@@ -113,35 +137,32 @@ class RedisService:
         Returns:
             用户ID，如果token不存在返回None
         """
-        redis = self.get_redis()
         token_key = f"refresh_token:{refresh_token}"
-        user_id_str = redis.get(token_key)
+        user_id_raw = await self.redis.get(token_key)
         
-        return int(user_id_str) if user_id_str else None
+        return int(user_id_raw) if user_id_raw else None
     
-    def revoke_access_token(self, access_token: str) -> None:
+    async def revoke_access_token(self, access_token: str) -> None:
         """
         撤销访问token
         
         Args:
             access_token: 访问token
         """
-        redis = self.get_redis()
         token_key = f"access_token:{access_token}"
-        redis.delete(token_key)
+        await self.redis.delete(token_key)
     
-    def revoke_refresh_token(self, refresh_token: str) -> None:
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
         """
         撤销刷新token
         
         Args:
             refresh_token: 刷新token
         """
-        redis = self.get_redis()
         token_key = f"refresh_token:{refresh_token}"
-        redis.delete(token_key)
+        await self.redis.delete(token_key)
     
-    def revoke_all_user_tokens(self, user_id: int) -> None:
+    async def revoke_all_user_tokens(self, user_id: int) -> None:
         """
         撤销用户的所有token（实现单点登录）
         
@@ -150,21 +171,39 @@ class RedisService:
         Args:
             user_id: 用户ID
         """
-        redis = self.get_redis()
-        user_tokens_key = f"user_tokens:{user_id}"
-        
-        # 获取用户的所有access token
-        tokens = redis.lrange(user_tokens_key, 0, -1)
+        # 服务端脚本一次往返完成读取与删除
+        await self._revoke_script(keys=[f"user_tokens:{user_id}"], args=["access_token:"])
+    
+    async def login_atomic(
+        self,
+        user_id: int,
+        access_token: str,
+        access_ttl: int,
+        refresh_token: str,
+        refresh_ttl: int,
+    ) -> None:
+        """
+        登录时一次性完成：撤销旧token + 存储新的访问token和刷新token
         
-        # 删除所有access token
-        for token in tokens:
-            token_key = f"access_token:{token}"
-            redis.delete(token_key)
+        通过Lua脚本在服务端原子执行，只需一次往返
         
-        # 清空用户的token列表
-        redis.delete(user_tokens_key)
+        Args:
+            user_id: 用户ID
+            access_token: 访问token
+            access_ttl: 访问token过期时间（秒）
+            refresh_token: 刷新token
+            refresh_ttl: 刷新token过期时间（秒）
+        """
+        await self._login_script(
+            keys=[
+                f"user_tokens:{user_id}",
+                f"access_token:{access_token}",
+                f"refresh_token:{refresh_token}",
+            ],
+            args=["access_token:", user_id, access_token, access_ttl, refresh_ttl],
+        )
     
-    def validate_access_token(self, access_token: str) -> bool:
+    async def validate_access_token(self, access_token: str) -> bool:
         """
         验证访问token是否有效
         
@@ -174,11 +213,9 @@ class RedisService:
         Returns:
             True表示token有效，False表示无效
         """
-        redis = self.get_redis()
-        token_key = f"access_token:{access_token}"
-        return redis.exists(token_key) > 0
+        return await self.get_user_id_by_access_token(access_token) is not None
     
-    def validate_refresh_token(self, refresh_token: str) -> bool:
+    async def validate_refresh_token(self, refresh_token: str) -> bool:
         """
         验证刷新token是否有效
         
@@ -188,9 +225,7 @@ class RedisService:
         Returns:
             True表示token有效，False表示无效
         """
-        redis = self.get_redis()
-        token_key = f"refresh_token:{refresh_token}"
-        return redis.exists(token_key) > 0
+        return await self.get_user_id_by_refresh_token(refresh_token) is not None
 
 
 # 全局单例
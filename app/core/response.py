@@ -1,15 +1,52 @@
 from typing import Any, Generic, Optional, TypeVar
 
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import ConfigDict
+
 from app.schemas.base_schema import BaseSchema
 
 T = TypeVar("T")
 
 
+def _orjson_default(obj: Any) -> Any:
+    """orjson 无法直接序列化的对象处理（pydantic模型、Decimal等）"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(by_alias=True)
+    return str(obj)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    使用 orjson 序列化的JSON响应（datetime、UUID 等由 orjson 原生处理）
+
+    content 为 bytes 时视为已序列化的JSON，直接作为响应体
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS, default=_orjson_default
+        )
+
+
+# 响应模型的序列化配置（与 BaseSchema 的配置合并）
+_RESPONSE_MODEL_CONFIG = ConfigDict(
+    ser_json_timedelta="iso8601",
+    ser_json_bytes="utf8",
+    validate_assignment=False,
+    arbitrary_types_allowed=False,
+)
+
+
 class BaseResponse(BaseSchema, Generic[T]):
     """
     统一响应格式
     """
 
+    model_config = _RESPONSE_MODEL_CONFIG
+
     success: bool = True
     data: Optional[T] = None
     message: str = ""
@@ -18,21 +55,48 @@ class BaseResponse(BaseSchema, Generic[T]):
     def success_res(cls, data: Any = None, message: str = "成功") -> "BaseResponse[T]":
         return cls(success=True, data=data, message=message)
 
+    @staticmethod
+    def success_bytes(data: Any = None, message: str = "成功") -> bytes:
+        """
+        直接序列化为JSON字节（跳过pydantic模型构造，适用于结构固定的简单响应）
+
+        data 需为 orjson 可直接序列化的对象，键名应已是驼峰形式
+        """
+        return orjson.dumps({"success": True, "data": data, "message": message})
+
     @classmethod
     def fail_res(cls, message: str = "失败", data: Any = None) -> "BaseResponse[T]":
         return cls(success=False, data=data, message=message)
 
+    def to_orjson_response(self, status_code: int = 200) -> ORJSONResponse:
+        """
+        转换为已序列化的JSON响应对象
+
+        由 pydantic-core 直接输出JSON（model_dump_json），不经过中间 dict
+        """
+        return ORJSONResponse(
+            content=self.model_dump_json(by_alias=True).encode(),
+            status_code=status_code,
+        )
+
 
 class PageData(BaseSchema, Generic[T]):
     """
     分页数据容器
+
+    默认不统计总数（total/total_page 为空），通过 has_more 判断是否还有下一页；
+    请求参数 withCount=true 时才返回总数。total_approx 为 True 时总数为表统计信息的估算值，仅供参考
     """
 
+    model_config = _RESPONSE_MODEL_CONFIG
+
     records: list[T]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_page: int
+    total_page: Optional[int] = None
+    total_approx: bool = False
+    has_more: bool = False
 
 
 class PageResponse(BaseResponse[PageData[T]], Generic[T]):
@@ -41,3 +105,25 @@ class PageResponse(BaseResponse[PageData[T]], Generic[T]):
     """
 
     pass
+
+
+class CursorPageData(BaseSchema, Generic[T]):
+    """
+    游标分页数据容器
+
+    next_cursor 为空表示没有更多数据
+    """
+
+    model_config = _RESPONSE_MODEL_CONFIG
+
+    records: list[T]
+    page_size: int
+    next_cursor: Optional[str] = None
+
+
+class CursorPageResponse(BaseResponse[CursorPageData[T]], Generic[T]):
+    """
+    统一游标分页响应格式
+    """
+
+    pass
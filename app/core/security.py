@@ -2,16 +2,24 @@
 安全工具类：JWT token管理和密码验证
 """
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import bcrypt
+import orjson
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.hash import pbkdf2_sha256
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
+from app.core.config import HOT, settings
 from app.core.redis_service import redis_service
 from app.db.session import get_db
 from app.models.user_model import User
@@ -20,10 +28,74 @@ from app.repositories.user_repository import UserRepository
 # OAuth2密码Bearer模式
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# bcrypt 成本因子；bcrypt 只使用密码的前72字节
+_BCRYPT_ROUNDS = 12
+_BCRYPT_MAX_BYTES = 72
+
+# 密码校验结果短期缓存：只缓存校验成功的结果，避免为暴力破解提供便利
+_verify_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
+# 缓存key的摘要密钥：进程启动时随机生成、只存在于内存中，
+# 读取到缓存key也无法离线暴力破解出明文（否则等于绕过了 KDF 的计算成本）
+_VERIFY_CACHE_KEY = os.urandom(32)
+
+
+def _b64url(raw: bytes) -> bytes:
+    """JWT使用的无填充base64url编码"""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+# HS256签名模板：密钥只初始化一次，每次签名时复制模板
+_HMAC_TEMPLATE = (
+    hmac.new(HOT.secret_key.encode(), None, hashlib.sha256)
+    if HOT.algorithm == "HS256"
+    else None
+)
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+# 解码参数只构造一次
+_DECODE_KEY = HOT.secret_key
+_DECODE_ALGORITHMS = [HOT.algorithm]
+
+
+def _encode_jwt(claims: dict) -> str:
+    """
+    编码JWT（HS256走预构建的HMAC模板，其他算法回退到jose）
+
+    Args:
+        claims: token载荷，exp为datetime
+
+    Returns:
+        str: JWT token字符串
+    """
+    if _HMAC_TEMPLATE is None:
+        return jwt.encode(claims, HOT.secret_key, algorithm=HOT.algorithm)
+
+    claims["exp"] = int(claims["exp"].timestamp())
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(claims))
+    signer = _HMAC_TEMPLATE.copy()
+    signer.update(signing_input)
+    return (signing_input + b"." + _b64url(signer.digest())).decode("ascii")
+
+
+def get_password_hash(password: str) -> str:
+    """
+    生成密码哈希（bcrypt）
+
+    Args:
+        password: 明文密码
+
+    Returns:
+        str: bcrypt 哈希（$2b$ 开头）
+    """
+    secret = password.encode()[:_BCRYPT_MAX_BYTES]
+    return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)).decode("ascii")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    验证密码（使用 PBKDF2）
+    验证密码
+
+    新密码使用 bcrypt；历史数据中的 PBKDF2 哈希仍可正常校验
 
     Args:
         plain_password: 明文密码
@@ -32,9 +104,73 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: 密码是否匹配
     """
+    if hashed_password.startswith("$2"):
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode()
+            )
+        except ValueError:
+            return False
     return pbkdf2_sha256.verify(plain_password, hashed_password)
 
 
+def verify_password_cached(plain_password: str, hashed_password: str) -> bool:
+    """
+    带短期缓存的密码验证
+
+    同一(明文, 哈希)组合在TTL内重复登录时跳过KDF计算；
+    缓存key为二者的带密钥blake2b摘要，不保存明文
+
+    Args:
+        plain_password: 明文密码
+        hashed_password: 加密后的密码
+
+    Returns:
+        bool: 密码是否匹配
+    """
+    key = _verify_cache_key(plain_password, hashed_password)
+    if key in _verify_cache:
+        return True
+    return _remember_verified(key, verify_password(plain_password, hashed_password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    带短期缓存的密码验证（异步版本，供请求处理中使用）
+
+    与 verify_password_cached 共用缓存；未命中时在线程池中执行 bcrypt/PBKDF2
+    （二者计算期间均释放GIL），避免耗时的KDF计算阻塞事件循环
+
+    Args:
+        plain_password: 明文密码
+        hashed_password: 加密后的密码
+
+    Returns:
+        bool: 密码是否匹配
+    """
+    key = _verify_cache_key(plain_password, hashed_password)
+    if key in _verify_cache:
+        return True
+    matched = await asyncio.to_thread(verify_password, plain_password, hashed_password)
+    return _remember_verified(key, matched)
+
+
+def _remember_verified(key: bytes, matched: bool) -> bool:
+    """记录KDF校验结果：只缓存成功的结果"""
+    if matched:
+        _verify_cache[key] = True
+    return matched
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    """密码验证缓存key：(明文, 哈希) 的带密钥blake2b摘要，不保存明文"""
+    return hashlib.blake2b(
+        plain_password.encode() + b"\x00" + hashed_password.encode(),
+        digest_size=16,
+        key=_VERIFY_CACHE_KEY,
+    ).digest()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     创建访问token
@@ -55,10 +191,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         )
 
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return _encode_jwt(to_encode)
 
 
 def create_refresh_token(data: dict) -> str:
@@ -74,10 +207,7 @@ def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return _encode_jwt(to_encode)
 
 
 def decode_token(token: str) -> dict:
@@ -94,10 +224,7 @@ def decode_token(token: str) -> dict:
         HTTPException: 当token无效或过期时抛出401错误
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        return payload
+        return jwt.decode(token, _DECODE_KEY, algorithms=_DECODE_ALGORITHMS)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -122,16 +249,12 @@ async def get_current_user(
     Raises:
         HTTPException: 当token无效、过期或用户不存在时抛出401错误
 
-    说明：会从Redis中验证token的有效性（支持单点登录）
+    说明：以Redis为准验证token的有效性（支持单点登录）。
+    access token只在签发后写入 access_token:{token}，TTL与JWT的exp一致，
+    命中即说明签名、类型与有效期均已校验过，无需再解码JWT
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="无法验证凭据",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
     # 从Redis中验证token是否有效（支持单点登录）
-    redis_user_id = redis_service.get_user_id_by_access_token(token)
+    redis_user_id = await redis_service.get_user_id_by_access_token(token)
     if redis_user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -139,28 +262,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    payload = decode_token(token)
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-
-    token_type: str = payload.get("type")
-    if token_type != "access":
+    repo = UserRepository(db)
+    user = await repo.get_by_id(redis_user_id)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="无效的token类型",
+            detail="无法验证凭据",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # 验证token中的user_id与Redis中存储的一致
-    if str(redis_user_id) != user_id:
-        raise credentials_exception
-
-    repo = UserRepository(db)
-    user = await repo.get_by_id(int(user_id))
-    if user is None:
-        raise credentials_exception
-
     return user
 
 
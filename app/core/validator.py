@@ -63,3 +63,34 @@ def validate_rules(value: Any, rules: List[ValidationRule]) -> Any:
                 raise ValueError(rule.message)
 
     return value
+
+
+# 密码强度校验用正则（模块加载时编译一次）
+_PASSWORD_DIGIT_RE = re.compile(r"\d")
+_PASSWORD_SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+# 常见弱密码前缀合并为一个分支正则，一次匹配
+_WEAK_PASSWORD_RE = re.compile(
+    r"^(?:123456|password|admin|qwerty|abc123|111111|000000)", re.IGNORECASE
+)
+
+
+def password_strength_error(password: str) -> Optional[str]:
+    """
+    检查密码强度
+
+    大小写判断使用 str.lower/upper 整串比较（C实现），避免逐字符的 Python 循环
+
+    Returns:
+        第一条不满足的规则提示，全部满足时返回 None
+    """
+    if password == password.lower():
+        return "密码必须包含至少一个大写字母"
+    if password == password.upper():
+        return "密码必须包含至少一个小写字母"
+    if not _PASSWORD_DIGIT_RE.search(password):
+        return "密码必须包含至少一个数字"
+    if not _PASSWORD_SPECIAL_RE.search(password):
+        return "密码必须包含至少一个特殊字符"
+    if _WEAK_PASSWORD_RE.match(password):
+        return "密码不能包含常见的弱密码模式"
+    return None
@@ -1,13 +1,14 @@
 import asyncio
-import bcrypt
 
 from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.core.security import create_access_token, get_password_hash
 from app.db.session import AsyncSessionLocal, Base, engine
 from app.models.log_model import SysLog  # noqa
+from app.repositories.log_repository import set_fulltext_columns
 
 # 导入模型以确保 Base.metadata 包含所有表
 from app.models.user_model import User  # noqa
@@ -42,13 +43,75 @@ async def init_models():
     print("✅ 所有表结构初始化完成")
 
 
+# sys_log 的全文索引：索引名 -> 列名（与 SysLog.__table_args__ 保持一致）
+_LOG_FULLTEXT_INDEXES = {
+    "ft_log_request_url": "request_url",
+    "ft_log_visit_module": "visit_module",
+}
+
+
+async def _log_fulltext_columns(conn) -> set[str]:
+    """查询 sys_log 上已建全文索引的列"""
+    result = await conn.execute(
+        text(
+            "SELECT COLUMN_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name "
+            "AND INDEX_TYPE = 'FULLTEXT'"
+        ),
+        {"table_name": SysLog.__tablename__},
+    )
+    return set(result.scalars().all())
+
+
+async def ensure_log_fulltext_indexes():
+    """
+    为存量 sys_log 表补建全文索引（幂等）
+
+    create_all 不会给已存在的表新增索引，因此单独检查并 ALTER TABLE；
+    建索引失败（权限不足等）时只提示，日志筛选回退为 LIKE
+    """
+    if engine.dialect.name != "mysql":
+        return
+    try:
+        async with engine.begin() as conn:
+            existing = await _log_fulltext_columns(conn)
+            for index_name, column in _LOG_FULLTEXT_INDEXES.items():
+                if column in existing:
+                    continue
+                print(f"🔧 为 {SysLog.__tablename__}.{column} 创建全文索引 {index_name}...")
+                await conn.execute(
+                    text(
+                        f"ALTER TABLE {SysLog.__tablename__} "
+                        f"ADD FULLTEXT INDEX {index_name} ({column}) WITH PARSER ngram"
+                    )
+                )
+    except SQLAlchemyError as e:
+        print(f"⚠️ 日志全文索引创建失败，URL/模块筛选将使用 LIKE: {str(e)}")
+
+
+async def detect_log_fulltext():
+    """
+    探测 sys_log 上实际存在的全文索引并登记到日志仓储（每个进程启动时调用）
+
+    非 MySQL 或探测失败时不登记任何列，URL/模块筛选使用 LIKE
+    """
+    if engine.dialect.name != "mysql":
+        set_fulltext_columns(())
+        return
+    try:
+        async with engine.connect() as conn:
+            columns = await _log_fulltext_columns(conn)
+    except SQLAlchemyError as e:
+        print(f"⚠️ 日志全文索引探测失败，URL/模块筛选将使用 LIKE: {str(e)}")
+        columns = set()
+    set_fulltext_columns(columns & set(_LOG_FULLTEXT_INDEXES.values()))
+
+
 async def create_super_admin():
     """
     创建超级管理员（如果不存在）
     返回超级管理员的token用于免登录
     """
-    from passlib.hash import pbkdf2_sha256
-
     async with AsyncSessionLocal() as session:
         # 检查超级管理员是否存在
         result = await session.execute(
@@ -63,10 +126,8 @@ async def create_super_admin():
             print(f"🔑 超级管理员Token: {token}")
             return token
 
-        # 创建超级管理员 - 使用PBKDF2哈希密码
-        hashed_password = pbkdf2_sha256.hash(
-            settings.SUPER_ADMIN_PASSWORD, rounds=100000
-        )
+        # 创建超级管理员 - 使用bcrypt哈希密码
+        hashed_password = get_password_hash(settings.SUPER_ADMIN_PASSWORD)
 
         # 直接创建，user_type=1为超级管理员
         admin = User(
@@ -99,6 +160,7 @@ async def run_init_db():
     try:
         await create_database_if_not_exists()
         await init_models()
+        await ensure_log_fulltext_indexes()
         await create_super_admin()  # 新增：创建超级管理员
         print("✨ 数据库巡检与初始化任务执行成功！")
     except Exception as e:
@@ -14,11 +14,15 @@ logging.basicConfig()
 engine = create_async_engine(
     settings.async_database_url,
     echo=settings.DEBUG,
-    pool_pre_ping=True,
+    # 不在每次借出连接时 ping：aiomysql 已开启 SO_KEEPALIVE，连接按 pool_recycle 定期重建；
+    # 数据库重启后首个使用失效连接的请求可能失败，连接池随后自动重连
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
+    # 后进先出：优先复用最近归还的热连接，突发流量后多余连接自然空闲并被回收
+    pool_use_lifo=True,
 )
 
 # 创建异步会话工厂
@@ -1,9 +1,13 @@
+import socket
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.auth_router import router as auth_router
@@ -13,9 +17,9 @@ from app.api.user_router import router as user_router
 from app.core.config import print_config_info, settings
 from app.core.exceptions import AppError, global_exception_handler
 from app.core.logger import get_logger, setup_structlog
-from app.db.init_db import run_init_db
+from app.db.init_db import detect_log_fulltext, run_init_db
 from app.db.session import check_db_connection
-from app.middleware.logging_middleware import LoggingMiddleware
+from app.middleware.logging_middleware import LoggingMiddleware, log_writer
 
 # 导入日志模型以确保表结构被创建
 from app.models.log_model import SysLog  # noqa
@@ -39,24 +43,30 @@ async def lifespan(app: FastAPI):
         await run_init_db()
 
     await check_db_connection()
+    await detect_log_fulltext()
     # 初始化缓存
     try:
-        from redis import asyncio as aioredis
-        from fastapi_cache import FastAPICache
-        from fastapi_cache.backends.redis import RedisBackend
-
-        # 构建Redis连接URL
-        if settings.REDIS_PASSWORD:
-            redis_url = f"redis://:{settings.REDIS_PASSWORD}@{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
-        else:
-            redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
-
-        # 创建Redis客户端实例
-        redis_client = aioredis.from_url(
-            redis_url,
+        # 显式配置连接池：连接耗尽时排队等待而非报错，开启TCP保活与定期健康检查；
+        # 连接参数直接传入，密码中含 @ / 等字符时无需URL编码
+        keepalive_options = (
+            {socket.TCP_KEEPIDLE: 60} if hasattr(socket, "TCP_KEEPIDLE") else {}
+        )
+        redis_pool = aioredis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD or None,
+            max_connections=settings.REDIS_POOL_SIZE,
+            timeout=5,
+            socket_timeout=settings.REDIS_TIMEOUT,
+            socket_keepalive=True,
+            socket_keepalive_options=keepalive_options,
+            health_check_interval=30,
             encoding="utf-8",
-            decode_responses=True
+            decode_responses=True,
         )
+        app.state.redis_pool = redis_pool
+        redis_client = aioredis.Redis(connection_pool=redis_pool)
 
         # 初始化FastAPICache，传入Redis客户端对象而非字符串
         FastAPICache.init(
@@ -69,14 +79,18 @@ async def lifespan(app: FastAPI):
             "缓存服务初始化成功",
             redis_url=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
         )
-    except ImportError:
-        logger.warning("fastapi-cache2 未安装，缓存功能已禁用。")
     except Exception as e:
         logger.error("缓存服务连接失败", error=str(e))
+    # 启动请求日志批量写入任务
+    log_writer.start()
     logger.info("应用启动成功")
     yield
     # 关闭时
     logger.info("应用正在关闭...")
+    await log_writer.stop()
+    redis_pool = getattr(app.state, "redis_pool", None)
+    if redis_pool is not None:
+        await redis_pool.disconnect()
 
 
 app = FastAPI(
@@ -84,8 +98,23 @@ app = FastAPI(
     description="基于 FastAPI 的分层架构用户管理系统",
     version="1.0.0",
     lifespan=lifespan,
+    # 全局异常处理：统一交给 global_exception_handler 按异常类型分发。
+    # FastAPI 的 HTTPException 是 StarletteHTTPException 的子类，按 MRO 命中同一处理函数，无需单独注册；
+    # Exception 由最外层 ServerErrorMiddleware 处理，其余类型由 ExceptionMiddleware 处理
+    exception_handlers={
+        AppError: global_exception_handler,
+        StarletteHTTPException: global_exception_handler,
+        RequestValidationError: global_exception_handler,
+        Exception: global_exception_handler,
+    },
 )
 
+# 中间件执行顺序（外 -> 内）：ServerErrorMiddleware -> CORSMiddleware -> LoggingMiddleware
+# -> ExceptionMiddleware -> 路由。后添加的中间件在外层，CORS 预检请求在外层直接返回，不进入日志中间件
+
+# 添加日志中间件
+app.add_middleware(LoggingMiddleware)
+
 # 添加CORS中间件
 app.add_middleware(
     CORSMiddleware,
@@ -95,22 +124,12 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-# 注册全局异常处理
-app.add_exception_handler(AppError, global_exception_handler)
-app.add_exception_handler(HTTPException, global_exception_handler)
-app.add_exception_handler(StarletteHTTPException, global_exception_handler)
-app.add_exception_handler(RequestValidationError, global_exception_handler)
-app.add_exception_handler(Exception, global_exception_handler)
-
 # 注册路由
 app.include_router(auth_router)
 app.include_router(user_router)
 app.include_router(health_router)
 app.include_router(log_router)
 
-# 添加日志中间件
-app.add_middleware(LoggingMiddleware)
-
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -119,5 +138,11 @@ async def root():
 
 if __name__ == "__main__":
     uvicorn.run(
-        "app.main:app", host="127.0.0.1", port=settings.APP_PORT, reload=settings.DEBUG
+        "app.main:app",
+        host="127.0.0.1",
+        port=settings.APP_PORT,
+        reload=settings.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if settings.DEBUG else settings.WORKERS,
     )
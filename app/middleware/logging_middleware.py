@@ -1,20 +1,29 @@
-import json
+import asyncio
 import logging
+import re
 import time
 from datetime import datetime
 from typing import List, Optional, Set, Union
+from urllib.parse import parse_qsl
 
+import orjson
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from starlette.types import ASGIApp
 
 from app.core.config import settings
-from app.models.log_model import SysLog
+from app.core.exceptions import INTERNAL_ERROR_BODY
+from app.db.session import AsyncSessionLocal
 from app.repositories.log_repository import SysLogRepository
 
 logger = logging.getLogger(__name__)
 
+# 记录查询参数 / 请求体参数的请求方法
+_QUERY_METHODS = frozenset(("GET", "DELETE"))
+_BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_EMPTY_ROUTE_INFO = {"visit_module": None, "operation_type": None}
+
 
 class LoggingMiddlewareConfig:
     """
@@ -53,6 +62,120 @@ class LoggingMiddlewareConfig:
         # 是否记录请求体
         self.log_request_body: bool = config.get("log_request_body", True)
 
+        # 排除规则预编译：方法用 frozenset，路径前缀用元组交给 str.startswith 在C层循环，
+        # 正则合并为一个（未配置时为 None）
+        self._excluded_methods: frozenset = frozenset(self.excluded_methods)
+        self._excluded_prefixes: tuple = tuple(self.excluded_paths)
+        self._excluded_re: Optional[re.Pattern] = (
+            re.compile(
+                "^(?:" + "|".join(f"(?:{p})" for p in self.excluded_path_patterns) + ")"
+            )
+            if self.excluded_path_patterns
+            else None
+        )
+
+    def is_excluded(self, method: str, path: str) -> bool:
+        """判断请求方法/路径是否命中排除规则"""
+        if method in self._excluded_methods or path.startswith(self._excluded_prefixes):
+            return True
+        return self._excluded_re is not None and self._excluded_re.match(path) is not None
+
+
+class SysLogWriter:
+    """
+    系统日志批量写入器
+
+    中间件只负责把日志行放入有界队列，后台任务按批取出后通过 executemany 一次写入，
+    将每个请求一次提交变为每批一次提交；队列满时丢弃日志，不阻塞请求。
+    取到第一条后最多再等待 linger 秒凑批（凑满 batch_size 立即写入），
+    低流量时也能把相邻请求的日志合并提交。
+    队列在 start() 时于当前事件循环中创建，写入任务未启动时日志直接丢弃
+    """
+
+    def __init__(
+        self, batch_size: int = 500, maxsize: int = 10000, linger: float = 0.05
+    ):
+        self.batch_size = batch_size
+        self.maxsize = maxsize
+        self.linger = linger
+        self.queue: Optional[asyncio.Queue] = None
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, row: dict) -> None:
+        """放入一条日志（不等待）"""
+        if self.queue is None:
+            return
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def start(self) -> None:
+        """启动后台写入任务（在应用 lifespan 中调用）"""
+        if self._task is None:
+            self.queue = asyncio.Queue(maxsize=self.maxsize)
+            self.dropped = 0
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台写入任务，并写出队列中剩余的日志"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self.queue.empty():
+            await self._flush(self._drain([]))
+        self.queue = None
+        if self.dropped:
+            logger.warning(f"日志队列已满，共丢弃 {self.dropped} 条日志")
+
+    def _drain(self, batch: list) -> list:
+        """在不等待的前提下尽量凑满一批"""
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _collect(self, batch: list) -> None:
+        """在 linger 时间窗内继续凑批，凑满 batch_size 或超时即返回"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.linger
+        while len(self._drain(batch)) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                return
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            try:
+                await self._collect(batch)
+            except asyncio.CancelledError:
+                # 停止时写出已取出的日志，剩余部分由 stop() 处理
+                await self._flush(batch)
+                raise
+            await self._flush(batch)
+
+    async def _flush(self, batch: list) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await SysLogRepository(session).bulk_create(batch)
+        except Exception as e:
+            logger.error(f"批量保存日志到数据库失败（{len(batch)} 条）: {str(e)}")
+            # 不抛出异常，避免后台任务退出
+
+
+# 全局单例
+log_writer = SysLogWriter()
+
 
 class LoggingMiddleware:
     """
@@ -63,7 +186,7 @@ class LoggingMiddleware:
     2. 支持排除特定路径、方法、状态码的日志记录
     3. 智能解析请求参数（GET/POST/PUT/PATCH等）
     4. 自动提取访问模块和操作类型
-    5. 异步保存日志，不影响业务性能
+    5. 日志入队后由后台任务批量写入，不影响业务性能
     6. 支持响应体截断和敏感信息过滤
     7. 完善的异常处理和错误恢复
 
@@ -78,52 +201,66 @@ class LoggingMiddleware:
         self.app = app
         # 初始化配置
         self.config = LoggingMiddlewareConfig()
+        self.log_writer = log_writer
+
+        # 路由对象id -> 路由信息缓存（路由随应用常驻，模块、操作类型定义后不再变化；
+        # APIRoute 定义了 __eq__ 不可哈希，因此以 id 作为key）
+        self._route_cache: dict[int, dict] = {}
+
+        # 响应体最多捕获的字节数：足以覆盖按字符截断的记录内容（UTF-8 单字符最多4字节），
+        # 额外的256字节用于判断操作结果状态；不记录响应体时只保留状态判断所需的前缀
+        self._capture_limit = (
+            self.config.max_response_length * 4 + 256
+            if self.config.log_response_body
+            else 256
+        )
+        # 请求体超过该字节数时不缓冲、不记录
+        self._body_capture_limit = self.config.max_request_length * 4
 
-        # 复用主数据库引擎和会话工厂，避免重复创建连接池
-        from app.db.session import AsyncSessionLocal
-        self.log_session_local = AsyncSessionLocal
-
-        logger.info(f"日志中间件已初始化（复用主数据库引擎），排除路径: {self.config.excluded_paths}")
+        logger.info(f"日志中间件已初始化，排除路径: {self.config.excluded_paths}")
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        # 创建请求对象
-        request = Request(scope, receive)
-
-        # 检查是否需要排除此请求
-        if self._should_exclude_request(request):
+        # 直接从 scope 判断是否排除，命中时不构造 Request 对象
+        if self.config.is_excluded(scope["method"], scope["path"]):
             await self.app(scope, receive, send)
             return
 
         # 记录请求开始时间
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
-            # 提取请求信息
-            request_info = self._extract_request_info(request)
-
-            # 解析请求参数
-            request_params, cached_body = await self._parse_request_params(request)
+            # 提取请求信息及查询参数（直接读取 scope，不构造 Request/URL/Headers 对象）
+            request_info, request_params = self._extract_request_info(scope)
+
+            # 解析请求体参数；大请求体与文件上传不缓冲，保持流式传递给业务处理
+            cached_body = None
+            more_body = False
+            if scope["method"] in _BODY_METHODS and self.config.log_request_body:
+                skip_reason = self._body_skip_reason(scope)
+                if skip_reason:
+                    request_params = {"_skipped": skip_reason}
+                else:
+                    request_params, cached_body, more_body = await self._parse_body_from_receive(
+                        receive
+                    )
 
             # 执行请求
             response_body, status_code = await self._execute_request(
-                scope, receive, send, cached_body
+                scope, receive, send, cached_body, more_body
             )
 
-            # 获取路由信息
-            route_info = self._extract_route_info(request)
+            # 获取路由信息（路由匹配后写入 scope）
+            route_info = self._extract_route_info(scope)
 
             # 计算耗时
-            duration = int((time.time() - start_time) * 1000)
-
-            # 操作结果状态
-            response_status = self._extract_response_status(response_body)
+            duration = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-            # 处理响应结果
-            response_result = self._process_response_body(response_body)
+            # 操作结果状态与响应结果
+            response_status, response_result = self._process_response(response_body)
 
             # 判断接口请求状态
             operation_status = "success" if status_code < 400 else "failure"
@@ -147,97 +284,154 @@ class LoggingMiddleware:
 
     def _should_exclude_request(self, request: Request) -> bool:
         """检查是否应该排除此请求的记录"""
-        path = request.url.path
-        method = request.method
-
-        # 检查路径前缀排除
-        for excluded_path in self.config.excluded_paths:
-            if path.startswith(excluded_path):
-                return True
-
-        # 检查HTTP方法排除
-        if method in self.config.excluded_methods:
-            return True
-
-        # 检查路径正则表达式排除
-        import re
-
-        for pattern in self.config.excluded_path_patterns:
-            if re.match(pattern, path):
-                return True
-
-        return False
-
-    def _extract_request_info(self, request: Request) -> dict:
-        """提取请求基本信息"""
-        return {
-            "request_url": str(request.url),
-            "request_method": request.method,
-            "client_ip": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent", "")[:500],
+        return self.config.is_excluded(request.method, request.url.path)
+
+    def _extract_request_info(self, scope) -> tuple:
+        """
+        一次遍历 scope 提取请求基本信息和查询参数
+
+        Returns:
+            (请求信息, 查询参数)；非 GET/DELETE 请求的查询参数为空字典
+        """
+        host = user_agent = None
+        for key, value in scope["headers"]:
+            if key == b"host":
+                host = value
+            elif key == b"user-agent":
+                user_agent = value
+
+        scheme = scope.get("scheme", "http")
+        if host is not None:
+            netloc = host.decode("latin-1")
+        elif scope.get("server"):
+            server_host, port = scope["server"]
+            netloc = (
+                server_host
+                if port == _DEFAULT_PORTS.get(scheme)
+                else f"{server_host}:{port}"
+            )
+        else:
+            netloc = ""
+
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        request_url = f"{scheme}://{netloc}{scope['path']}"
+        if query_string:
+            request_url = f"{request_url}?{query_string}"
+
+        client = scope.get("client")
+        request_info = {
+            "request_url": request_url,
+            "request_method": scope["method"],
+            "client_ip": client[0] if client else None,
+            "user_agent": user_agent[:500].decode("latin-1") if user_agent else "",
         }
 
-    async def _parse_request_params(self, request: Request) -> tuple:
-        """解析请求参数"""
         request_params = {}
-        cached_body = b""
+        if query_string and scope["method"] in _QUERY_METHODS:
+            request_params = dict(parse_qsl(query_string, keep_blank_values=True))
+
+        return request_info, request_params
 
+    def _body_skip_reason(self, scope) -> Optional[str]:
+        """
+        判断请求体是否跳过记录：文件上传，或声明的长度超过可记录长度
+
+        未声明 Content-Length（分块传输）时按实际读取处理
+        """
+        for key, value in scope["headers"]:
+            if key == b"content-type" and value.startswith(b"multipart/"):
+                return "multipart"
+            if key == b"content-length":
+                try:
+                    if int(value) > self._body_capture_limit:
+                        return "body_too_large"
+                except ValueError:
+                    # 无法解析的长度按未声明处理，继续检查其余请求头
+                    continue
+        return None
+
+    async def _parse_body_from_receive(self, receive) -> tuple:
+        """
+        读取并解析请求体参数，返回 (请求体参数, 已读取的请求体, 是否还有未读取的部分)
+
+        未声明长度的请求体读取超过可记录长度时停止缓冲，剩余部分由业务处理直接从原始 receive 读取
+        """
+        chunks = []
+        size = 0
+        more_body = False
         try:
-            if request.method in ["GET", "DELETE"]:
-                request_params = dict(request.query_params)
-            elif (
-                request.method in ["POST", "PUT", "PATCH"]
-                and self.config.log_request_body
-            ):
-                cached_body = await request.body()
-                if cached_body:
-                    request_params = self._parse_body_params(cached_body)
+            while True:
+                message = await receive()
+                if message["type"] != "http.request":
+                    break
+                body = message.get("body", b"")
+                chunks.append(body)
+                size += len(body)
+                more_body = message.get("more_body", False)
+                if not more_body or size > self._body_capture_limit:
+                    break
         except Exception as e:
             logger.warning(f"解析请求参数失败: {str(e)}")
 
-        return request_params, cached_body
+        cached_body = b"".join(chunks)
+        if more_body:
+            return {"_skipped": "body_too_large"}, cached_body, True
+        return (self._parse_body_params(cached_body) if cached_body else {}), cached_body, False
 
     def _parse_body_params(self, body: bytes) -> dict:
         """解析请求体参数"""
         try:
-            return json.loads(body)
-        except json.JSONDecodeError:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
             # 如果不是JSON，返回空字典（不记录非JSON的请求体）
             return {}
 
-    async def _execute_request(self, scope, receive, send, cached_body: bytes) -> tuple:
-        """执行请求并捕获响应"""
-        response_body = bytearray()
+    async def _execute_request(
+        self, scope, receive, send, cached_body: Optional[bytes], more_body: bool = False
+    ) -> tuple:
+        """
+        执行请求并捕获响应
+
+        cached_body 为已读取的请求体，会重新交给业务处理；为 None 时直接透传原始 receive。
+        more_body 为 True 表示请求体只读取了前一部分，其余部分继续从原始 receive 读取
+        """
+        chunks: List[bytes] = []
+        captured = 0
+        capture_limit = self._capture_limit
         status_code = 200
-        body_sent = False
+        body_replayed = False
         response_started = False
 
         async def send_wrapper(message):
-            nonlocal status_code, response_body, body_sent, response_started
+            nonlocal status_code, response_started, captured
             if message["type"] == "http.response.start":
                 status_code = message["status"]
                 response_started = True
             elif message["type"] == "http.response.body":
-                if "body" in message and message["body"]:
-                    response_body.extend(message["body"])
-                # 检查是否还有更多body数据
-                body_sent = not message.get("more_body", False)
+                body = message.get("body")
+                # 只保留日志需要的前缀，大响应/流式响应不在内存中完整缓存；原消息照常发送
+                if body and captured < capture_limit:
+                    chunks.append(body[: capture_limit - captured])
+                    captured += len(body)
             await send(message)
 
         async def receive_wrapper():
-            nonlocal body_sent
-            if not body_sent:
-                body_sent = True
-                return {"type": "http.request", "body": cached_body, "more_body": False}
+            nonlocal body_replayed
+            if not body_replayed:
+                body_replayed = True
+                return {"type": "http.request", "body": cached_body, "more_body": more_body}
             return await receive()
 
         try:
-            await self.app(scope, receive_wrapper, send_wrapper)
+            await self.app(
+                scope, receive if cached_body is None else receive_wrapper, send_wrapper
+            )
+            # 响应体分块收集，结束后一次拼接
+            response_body = b"".join(chunks)
         except Exception as e:
             logger.error(f"请求处理异常: {str(e)}", exc_info=True)
             status_code = 500
-            error_message = str(e)
-            response_body = bytearray(error_message.encode("utf-8"))
+            response_body = str(e).encode("utf-8")
 
             # 如果响应还未开始，需要手动发送响应
             if not response_started:
@@ -248,55 +442,64 @@ class LoggingMiddleware:
                         "status": 500,
                         "headers": [[b"content-type", b"application/json"]],
                     })
-                    # 发送响应体
-                    error_response = json.dumps({
-                        "success": False,
-                        "message": "服务器内部错误",
-                        "data": None
-                    }, ensure_ascii=False).encode("utf-8")
-                    response_body = bytearray(error_response)
+                    # 发送响应体（复用预序列化的500响应体）
+                    response_body = INTERNAL_ERROR_BODY
                     await send({
                         "type": "http.response.body",
-                        "body": error_response,
+                        "body": INTERNAL_ERROR_BODY,
                     })
                 except Exception as send_error:
                     logger.error(f"发送错误响应失败: {str(send_error)}")
 
         return response_body, status_code
 
-    def _extract_route_info(self, request: Request) -> dict:
-        """提取路由信息"""
-        route = request.scope.get("route")
+    def _extract_route_info(self, scope) -> dict:
+        """提取路由信息（按路由对象缓存，返回的字典只读）"""
+        route = scope.get("route")
         if not route:
-            return {"visit_module": None, "operation_type": None}
-
-        visit_module = route.tags[0] if route.tags else None
-        operation_type = getattr(route, "summary", None)
-        if not operation_type:
-            operation_type = getattr(route, "operation_id", None)
-
-        return {"visit_module": visit_module, "operation_type": operation_type}
+            return _EMPTY_ROUTE_INFO
+
+        route_info = self._route_cache.get(id(route))
+        if route_info is None:
+            tags = getattr(route, "tags", None)
+            route_info = {
+                "visit_module": tags[0] if tags else None,
+                "operation_type": getattr(route, "summary", None)
+                or getattr(route, "operation_id", None),
+            }
+            self._route_cache[id(route)] = route_info
+        return route_info
+
+    def _process_response(self, response_body: bytes) -> tuple:
+        """
+        处理响应体，返回 (操作结果状态, 截断后的响应文本)
+
+        只解码需要记录的前缀；统一响应格式以 success 字段开头，优先用字节前缀判断状态，
+        无法判断时才完整解析JSON
+        """
+        if response_body.startswith(b'{"success":true'):
+            response_status = "success"
+        elif response_body.startswith(b'{"success":false'):
+            response_status = "failure"
+        else:
+            response_status = self._extract_response_status(response_body)
 
-    def _process_response_body(self, response_body: bytearray) -> str:
-        """处理响应体"""
         if not self.config.log_response_body:
-            return ""
+            return response_status, ""
 
-        try:
-            response_result = response_body.decode("utf-8", errors="ignore")
-            return response_result[: self.config.max_response_length]
-        except Exception:
-            return str(response_body)
+        # UTF-8 单字符最多4字节，按字符数截断前只解码必要的前缀
+        limit = self.config.max_response_length
+        response_result = response_body[: limit * 4].decode("utf-8", errors="ignore")
+        return response_status, response_result[:limit]
 
-    def _extract_response_status(self, response_body: bytearray) -> str:
-        """从响应体中提取操作结果状态"""
+    def _extract_response_status(self, response_body: bytes) -> str:
+        """从响应体中解析操作结果状态"""
         try:
             if not response_body:
                 return "unknown"
 
-            # 尝试解析JSON响应
-            response_text = response_body.decode("utf-8", errors="ignore")
-            response_data = json.loads(response_text)
+            # orjson 直接解析字节，无需先解码
+            response_data = orjson.loads(response_body)
 
             # 检查是否有success字段
             if isinstance(response_data, dict) and "success" in response_data:
@@ -308,7 +511,7 @@ class LoggingMiddleware:
                 # 假设200表示成功，其他表示失败
                 return "success" if code == 200 else "failure"
 
-        except (json.JSONDecodeError, KeyError, TypeError):
+        except (orjson.JSONDecodeError, KeyError, TypeError):
             # 如果解析失败，返回unknown
             pass
 
@@ -317,12 +520,12 @@ class LoggingMiddleware:
     async def _save_log_entry(self, **kwargs):
         """保存日志条目"""
         try:
-            log_entry = SysLog(
+            self.log_writer.put(dict(
                 request_url=kwargs["request_info"]["request_url"],
                 request_method=kwargs["request_info"]["request_method"],
-                request_params=json.dumps(
-                    kwargs["request_params"], ensure_ascii=False, default=str
-                ),
+                request_params=orjson.dumps(
+                    kwargs["request_params"], default=str
+                ).decode(),
                 visit_module=kwargs["route_info"]["visit_module"],
                 operation_type=kwargs["route_info"]["operation_type"],
                 operation_status=kwargs["operation_status"],
@@ -332,21 +535,6 @@ class LoggingMiddleware:
                 duration=kwargs["duration"],
                 client_ip=kwargs["request_info"]["client_ip"],
                 user_agent=kwargs["request_info"]["user_agent"],
-            )
-            await self._save_log_async(log_entry)
+            ))
         except Exception as e:
             logger.error(f"保存日志失败: {str(e)}")
-
-    async def _save_log_async(self, log_entry: SysLog):
-        """异步保存日志，使用独立的数据库会话"""
-        try:
-            async with self.get_log_session()() as session:
-                repo = SysLogRepository(session)
-                await repo.create(log_entry)
-        except Exception as e:
-            logger.error(f"保存日志到数据库失败: {str(e)}")
-            # 不抛出异常，避免影响业务逻辑
-
-    def get_log_session(self):
-        """获取数据库会话（复用主数据库引擎）"""
-        return self.log_session_local
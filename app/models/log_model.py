@@ -1,5 +1,4 @@
-from sqlalchemy import Column, DateTime, Index, Integer, String, Text
-from sqlalchemy.sql import func
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, text
 
 from app.db.session import Base
 
@@ -12,9 +11,32 @@ class SysLog(Base):
     __tablename__ = "sys_log"
 
     __table_args__ = (
-        Index("idx_request_time", "request_time"),  # 请求时间索引
-        Index("idx_visit_module", "visit_module"),  # 访问模块索引
-        Index("idx_operation_status", "operation_status"),  # 操作状态索引
+        # 日志列表按请求时间倒序分页，并按时间范围、模块、状态筛选：
+        # 复合索引按时间倒序扫描，模块/状态条件在索引内过滤；
+        # 状态只有 success/failure 两个值，单列索引选择性差，只会增加写入开销
+        Index(
+            "idx_log_time_module_status",
+            text("request_time DESC"),
+            "visit_module",
+            "operation_status",
+        ),
+        # 列表按 (request_time, id) 倒序排序：OFFSET 分页按索引顺序扫描，游标分页按索引定位起点
+        Index("idx_log_time_id", text("request_time DESC"), text("id DESC")),
+        # URL/模块的模糊筛选：前置通配的 LIKE 无法使用 B-Tree 索引，
+        # MySQL 下改用 ngram 分词的全文索引（支持中文），仅在 MySQL 中创建；
+        # 存量表由 init_db.ensure_log_fulltext_indexes 补建
+        Index(
+            "ft_log_request_url",
+            "request_url",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+        Index(
+            "ft_log_visit_module",
+            "visit_module",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True, comment="日志ID")
@@ -32,11 +54,9 @@ class SysLog(Base):
         String(20), nullable=False, comment="操作结果状态(success/failure)"
     )
     response_result = Column(Text, comment="返回结果(JSON格式)")
-    request_time = Column(DateTime(timezone=True), nullable=False, comment="请求时间")
+    # 由写入方（日志中间件）传入，同时作为日志的创建时间，不再单独维护 created_at
+    request_time = Column(DateTime, nullable=False, comment="请求时间")
     duration = Column(Integer, comment="耗时(毫秒)")
     user_info = Column(String(500), comment="用户信息(JSON格式)")
     client_ip = Column(String(50), comment="客户端IP")
     user_agent = Column(String(500), comment="客户端User-Agent")
-    created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), comment="创建时间"
-    )
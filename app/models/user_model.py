@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
 from sqlalchemy.sql import func
 
@@ -33,12 +35,18 @@ class User(Base):
         nullable=False,
         comment="用户类型：1-超级管理员，9-普通用户",
     )
+    # 时间戳在应用侧生成（与日志的 request_time 一致），插入/更新后对象上已有值，
+    # 无需再回查数据库；server_default 保留给直接写库的场景
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), comment="创建时间"
+        DateTime(timezone=True),
+        default=datetime.now,
+        server_default=func.now(),
+        comment="创建时间",
     )
     updated_at = Column(
         DateTime(timezone=True),
-        onupdate=func.now(),
+        default=datetime.now,
+        onupdate=datetime.now,
         server_default=func.now(),
         comment="更新时间",
     )
@@ -1,11 +1,51 @@
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, delete, func, insert, select, tuple_
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.log_model import SysLog
 
+# 按ID批量删除时每条 DELETE 携带的ID数量（避免超出数据库参数个数上限）
+_DELETE_ID_CHUNK_SIZE = 1000
+# 按时间清理时每批删除的行数（每批单独提交，避免长时间持有大量行锁）
+_PURGE_BATCH_SIZE = 10000
+
+# 全文检索的最短关键字长度（与 MySQL ngram_token_size 默认值一致），更短时回退为 LIKE
+_FULLTEXT_MIN_LENGTH = 2
+
+# 已确认建有全文索引的列（应用启动时探测后登记）。未登记的列即使在 MySQL 下也使用 LIKE，
+# 避免在缺少全文索引的存量表上 MATCH 报错（1191 Can't find FULLTEXT index）
+_FULLTEXT_COLUMNS: set[str] = set()
+
+
+def set_fulltext_columns(columns) -> None:
+    """
+    登记 sys_log 上实际存在全文索引的列
+
+    Args:
+        columns: 列名集合
+    """
+    _FULLTEXT_COLUMNS.clear()
+    _FULLTEXT_COLUMNS.update(columns)
+
+
+def _contains(column, value: str, use_fulltext: bool):
+    """
+    子串筛选条件
+
+    MySQL 且该列已建全文索引时使用 ngram 全文索引的短语匹配（MATCH ... AGAINST），否则使用 LIKE
+    """
+    if (
+        use_fulltext
+        and column.key in _FULLTEXT_COLUMNS
+        and len(value) >= _FULLTEXT_MIN_LENGTH
+    ):
+        phrase = value.replace('"', " ")
+        return match(column, against=f'"{phrase}"').in_boolean_mode()
+    return column.like(f"%{value}%")
+
 
 class SysLogRepository:
     """
@@ -15,26 +55,76 @@ class SysLogRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create(self, log: SysLog) -> SysLog:
+    async def create(self, row: dict) -> None:
         """
-        创建系统日志记录
+        创建系统日志记录（Core insert，日志只写不读，不回读主键）
 
         Args:
-            log: 系统日志对象
+            row: 日志字段字典
+        """
+        await self.bulk_create([row])
 
-        Returns:
-            创建的系统日志对象
+    async def bulk_create(self, rows: List[dict]) -> None:
+        """
+        批量写入日志记录（Core executemany，不回读主键）
+
+        Args:
+            rows: 日志字段字典列表
         """
-        self.db.add(log)
+        await self.db.execute(insert(SysLog), rows)
         await self.db.commit()
-        await self.db.refresh(log)
-        return log
+
+    def _build_conditions(self, filters: Optional[dict]) -> list:
+        """
+        构建日志列表的过滤条件
+
+        Args:
+            filters: 过滤条件
+
+        Returns:
+            SQL条件列表
+        """
+        conditions = []
+        if not filters:
+            return conditions
+
+        use_fulltext = self.db.get_bind().dialect.name == "mysql"
+
+        if filters.get("request_url"):
+            conditions.append(
+                _contains(SysLog.request_url, filters["request_url"], use_fulltext)
+            )
+
+        if filters.get("request_method"):
+            conditions.append(SysLog.request_method == filters["request_method"])
+
+        if filters.get("visit_module"):
+            conditions.append(
+                _contains(SysLog.visit_module, filters["visit_module"], use_fulltext)
+            )
+
+        if filters.get("operation_status"):
+            conditions.append(SysLog.operation_status == filters["operation_status"])
+
+        if filters.get("client_ip"):
+            conditions.append(SysLog.client_ip == filters["client_ip"])
+
+        if filters.get("start_time"):
+            conditions.append(SysLog.request_time >= filters["start_time"])
+
+        if filters.get("end_time"):
+            conditions.append(SysLog.request_time <= filters["end_time"])
+
+        return conditions
 
     async def get_list(
         self, page: int, page_size: int, filters: Optional[dict] = None
-    ) -> Tuple[List[SysLog], int]:
+    ) -> Tuple[List[SysLog], bool]:
         """
-        分页查询日志列表
+        分页查询日志列表（OFFSET分页，供需要跳页的管理界面使用）
+
+        countless 模式：多取一条判断是否还有下一页，不再每次查询总数；
+        总数由 count() 按需单独查询
 
         Args:
             page: 页码
@@ -42,59 +132,86 @@ class SysLogRepository:
             filters: 过滤条件
 
         Returns:
-            日志列表和总数量
+            日志列表和是否还有下一页
         """
         query = select(SysLog)
 
-        # 构建过滤条件
-        if filters:
-            conditions = []
+        conditions = self._build_conditions(filters)
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        # id 作为次级排序键：请求时间相同时顺序稳定，翻页不重复、不遗漏
+        offset = (page - 1) * page_size
+        query = (
+            query.order_by(SysLog.request_time.desc(), SysLog.id.desc())
+            .offset(offset)
+            .limit(page_size + 1)
+        )
+
+        result = await self.db.execute(query)
+        logs = result.scalars().all()
+        has_more = len(logs) > page_size
 
-            if filters.get("request_url"):
-                conditions.append(
-                    SysLog.request_url.like(f"%{filters['request_url']}%")
-                )
+        return list(logs[:page_size]), has_more
 
-            if filters.get("request_method"):
-                conditions.append(SysLog.request_method == filters["request_method"])
+    async def count(self, filters: Optional[dict] = None) -> int:
+        """
+        查询符合过滤条件的日志总数
 
-            if filters.get("visit_module"):
-                conditions.append(
-                    SysLog.visit_module.like(f"%{filters['visit_module']}%")
-                )
+        Args:
+            filters: 过滤条件
 
-            if filters.get("operation_status"):
-                conditions.append(
-                    SysLog.operation_status == filters["operation_status"]
-                )
+        Returns:
+            日志总数
+        """
+        query = select(func.count()).select_from(SysLog)
 
-            if filters.get("client_ip"):
-                conditions.append(SysLog.client_ip == filters["client_ip"])
+        conditions = self._build_conditions(filters)
+        if conditions:
+            query = query.where(and_(*conditions))
 
-            if filters.get("start_time"):
-                conditions.append(SysLog.request_time >= filters["start_time"])
+        result = await self.db.execute(query)
+        return result.scalar() or 0
+
+    async def get_list_keyset(
+        self,
+        cursor: Optional[Tuple[datetime, int]],
+        page_size: int,
+        filters: Optional[dict] = None,
+    ) -> Tuple[List[SysLog], Optional[Tuple[datetime, int]]]:
+        """
+        游标分页查询日志列表（按请求时间、ID倒序）
 
-            if filters.get("end_time"):
-                conditions.append(SysLog.request_time <= filters["end_time"])
+        以上一页最后一条记录的 (request_time, id) 为起点，无论翻到第几页都只扫描 page_size 条
 
-            if conditions:
-                query = query.where(and_(*conditions))
+        Args:
+            cursor: 上一页最后一条记录的 (request_time, id)，None 表示第一页
+            page_size: 每页数量
+            filters: 过滤条件
 
-        # 获取总数
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        Returns:
+            日志列表和下一页游标（没有更多数据时为 None）
+        """
+        conditions = self._build_conditions(filters)
+        if cursor is not None:
+            conditions.append(tuple_(SysLog.request_time, SysLog.id) < tuple_(*cursor))
 
-        # 分页查询
-        offset = (page - 1) * page_size
-        query = (
-            query.order_by(SysLog.request_time.desc()).offset(offset).limit(page_size)
-        )
+        query = select(SysLog)
+        if conditions:
+            query = query.where(and_(*conditions))
 
+        # 多取一条用于判断是否还有下一页
+        query = query.order_by(SysLog.request_time.desc(), SysLog.id.desc()).limit(
+            page_size + 1
+        )
         result = await self.db.execute(query)
-        logs = result.scalars().all()
+        logs = list(result.scalars().all())
 
-        return list(logs), total
+        if len(logs) <= page_size:
+            return logs, None
+
+        logs = logs[:page_size]
+        return logs, (logs[-1].request_time, logs[-1].id)
 
     async def batch_delete(self, log_ids: List[int]) -> int:
         """
@@ -106,10 +223,44 @@ class SysLogRepository:
         Returns:
             删除的记录数
         """
-        query = delete(SysLog).where(SysLog.id.in_(log_ids))
-        result = await self.db.execute(query)
+        deleted = 0
+        # 分块删除，同一事务内完成，最后统一提交
+        for i in range(0, len(log_ids), _DELETE_ID_CHUNK_SIZE):
+            query = (
+                delete(SysLog)
+                .where(SysLog.id.in_(log_ids[i : i + _DELETE_ID_CHUNK_SIZE]))
+                .execution_options(synchronize_session=False)
+            )
+            result = await self.db.execute(query)
+            deleted += result.rowcount
         await self.db.commit()
-        return result.rowcount
+        return deleted
+
+    async def _purge(self, conditions: list) -> int:
+        """
+        分批删除符合条件的日志，每批单独提交
+
+        MySQL 下使用 DELETE ... LIMIT 限制每批行数；其他数据库不支持该语法，一次删除完成
+
+        Args:
+            conditions: 删除条件
+
+        Returns:
+            删除的记录数
+        """
+        query = (
+            delete(SysLog)
+            .where(and_(*conditions))
+            .with_dialect_options(mysql_limit=_PURGE_BATCH_SIZE)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = 0
+        while True:
+            result = await self.db.execute(query)
+            await self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < _PURGE_BATCH_SIZE:
+                return deleted
 
     async def delete_by_time_range(
         self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
@@ -135,10 +286,7 @@ class SysLogRepository:
         if not conditions:
             return 0
 
-        query = delete(SysLog).where(and_(*conditions))
-        result = await self.db.execute(query)
-        await self.db.commit()
-        return result.rowcount
+        return await self._purge(conditions)
 
     async def delete_logs_before_days(self, days: int) -> int:
         """
@@ -151,10 +299,7 @@ class SysLogRepository:
             删除的记录数
         """
         cutoff_time = datetime.now() - timedelta(days=days)
-        query = delete(SysLog).where(SysLog.request_time < cutoff_time)
-        result = await self.db.execute(query)
-        await self.db.commit()
-        return result.rowcount
+        return await self._purge([SysLog.request_time < cutoff_time])
 
     async def delete_all(self) -> int:
         """
@@ -1,10 +1,37 @@
+import re
 from typing import Any, List, Optional, Tuple
 
-from sqlalchemy import delete, func, select, update
+from cachetools import TTLCache
+from sqlalchemy import Row, delete, exists, func, select, text, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user_model import User
 
+# 登录路径的用户名查询短期缓存：user_name -> Optional[User]（不存在的用户也缓存）
+_USER_NAME_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=2.0)
+
+# 表统计行数达到该值时，非首页的总数改用统计信息中的估算值（更小的表精确 COUNT 的代价可以忽略）
+_APPROX_COUNT_THRESHOLD = 100_000
+
+# 唯一索引冲突信息中的索引/列名部分（只解析这一部分，冲突的值本身可能包含任意字段名）
+# MySQL: Duplicate entry 'x' for key 'sys_users.ix_sys_users_email'（5.7 无表名前缀）
+_MYSQL_DUPLICATE_KEY_RE = re.compile(r"Duplicate entry '.*' for key '(?:[^'.]+\.)?([^'.]+)'", re.S)
+# SQLite: UNIQUE constraint failed: sys_users.email
+_SQLITE_UNIQUE_RE = re.compile(r"UNIQUE constraint failed: \w+\.(\w+)$")
+
+# 用户列表输出（UserOut）所需的列：列表查询只取这些列，跳过 ORM 对象的构造与身份映射
+_USER_OUT_COLUMNS = (
+    User.user_id,
+    User.user_name,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.created_at,
+    User.updated_at,
+    User.user_type,
+)
+
 
 class UserRepository:
     """
@@ -20,67 +47,253 @@ class UserRepository:
         )
         return result.scalars().first()
 
+    async def exists(self, user_id: int) -> bool:
+        """
+        判断用户是否存在（未软删除）
+
+        只需要存在性时使用：SELECT EXISTS 返回单个布尔值，不加载整行、不构造 ORM 对象
+        """
+        return bool(
+            await self.db.scalar(
+                select(exists().where(User.user_id == user_id, User.is_deleted == False))
+            )
+        )
+
     async def get_by_user_name(self, user_name: str) -> Optional[User]:
         result = await self.db.execute(
             select(User).where(User.user_name == user_name, User.is_deleted == False)
         )
         return result.scalars().first()
 
+    async def get_by_user_name_cached(self, user_name: str) -> Optional[User]:
+        """
+        带短期缓存的用户名查询（用于登录，削减撞库时的数据库查询）
+        """
+        try:
+            return _USER_NAME_CACHE[user_name]
+        except KeyError:
+            pass
+        user = await self.get_by_user_name(user_name)
+        _USER_NAME_CACHE[user_name] = user
+        return user
+
+    @staticmethod
+    def invalidate_user_name(user_name: str) -> None:
+        """
+        清除指定用户名的查询缓存（用户新增、更新、删除后调用）
+        """
+        _USER_NAME_CACHE.pop(user_name, None)
+
     async def get_by_email(self, email: str) -> Optional[User]:
         result = await self.db.execute(
             select(User).where(User.email == email, User.is_deleted == False)
         )
         return result.scalars().first()
 
-    async def get_list(
-        self, page: int = 1, page_size: int = 10, current_user: Optional[User] = None
-    ) -> Tuple[List[User], int]:
-        # 计算偏移量
-        offset = (page - 1) * page_size
-
-        # 构建查询条件
+    @staticmethod
+    def _list_conditions(current_user: Optional[User]) -> list:
+        """用户列表的查询条件"""
         conditions = [User.is_deleted == False]
-        
+
         # 如果不是管理员，过滤掉管理员用户
         if current_user and current_user.user_type != 1:
             conditions.append(User.user_type != 1)
+        return conditions
+
+    async def get_list(
+        self, page: int = 1, page_size: int = 10, current_user: Optional[User] = None
+    ) -> Tuple[List[Row], bool]:
+        """
+        分页查询用户列表（countless 模式：不查询总数）
+
+        多取一条判断是否还有下一页，总数由 count() 按需单独查询；
+        只查询输出所需的列，返回的行支持按属性名访问（user.user_id 等）
+
+        Returns:
+            用户行列表和是否还有下一页
+        """
+        # 计算偏移量
+        offset = (page - 1) * page_size
 
-        # 查询总数
-        count_result = await self.db.execute(
-            select(func.count(User.user_id)).where(*conditions)
+        result = await self.db.execute(
+            select(*_USER_OUT_COLUMNS)
+            .where(*self._list_conditions(current_user))
+            .offset(offset)
+            .limit(page_size + 1)
+            .order_by(User.user_id.desc())
         )
-        total = count_result.scalar() or 0
+        items = result.all()
+        has_more = len(items) > page_size
+        return list(items[:page_size]), has_more
+
+    async def get_list_keyset(
+        self, cursor: Optional[int], page_size: int, current_user: Optional[User] = None
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        游标分页查询用户列表（按用户ID倒序）
+
+        以上一页最后一个用户ID为起点，沿主键索引定位，无论翻到第几页都只扫描 page_size 条
+
+        Args:
+            cursor: 上一页最后一个用户ID，None 表示第一页
+            page_size: 每页数量
+            current_user: 当前用户（用于权限过滤）
+
+        Returns:
+            用户行列表和下一页游标（没有更多数据时为 None）
+        """
+        conditions = self._list_conditions(current_user)
+        if cursor is not None:
+            conditions.append(User.user_id < cursor)
 
-        # 查询列表
+        # 多取一条用于判断是否还有下一页
         result = await self.db.execute(
-            select(User)
+            select(*_USER_OUT_COLUMNS)
             .where(*conditions)
+            .order_by(User.user_id.desc())
+            .limit(page_size + 1)
+        )
+        items = list(result.all())
+
+        if len(items) <= page_size:
+            return items, None
+
+        items = items[:page_size]
+        return items, items[-1].user_id
+
+    async def get_list_with_total(
+        self, page: int = 1, page_size: int = 10, current_user: Optional[User] = None
+    ) -> Tuple[List[Row], int]:
+        """
+        分页查询用户列表并同时返回总数
+
+        通过窗口函数 COUNT(*) OVER() 在同一条查询中取回总数，省去单独的 COUNT 查询；
+        页码超出范围（结果为空）时无法从行中读取总数，回退为 count()
+
+        Returns:
+            用户行列表和总数
+        """
+        offset = (page - 1) * page_size
+
+        result = await self.db.execute(
+            select(*_USER_OUT_COLUMNS, func.count().over().label("_total"))
+            .where(*self._list_conditions(current_user))
             .offset(offset)
             .limit(page_size)
             .order_by(User.user_id.desc())
         )
-        items = result.scalars().all()
-        return list(items), total
+        items = list(result.all())
+        if items:
+            return items, items[0]._total
+        if page == 1:
+            return items, 0
+        return items, await self.count(current_user)
+
+    async def count(self, current_user: Optional[User] = None) -> int:
+        """
+        查询用户总数（与 get_list 使用相同的过滤条件）
+        """
+        result = await self.db.execute(
+            select(func.count(User.user_id)).where(*self._list_conditions(current_user))
+        )
+        return result.scalar() or 0
+
+    async def approx_count(self) -> Optional[int]:
+        """
+        从表统计信息读取用户表的估算行数（不扫描数据，不区分过滤条件，包含已软删除的行；
+        InnoDB 的统计值可能偏差较大，只能作为近似总数返回）
+
+        仅 MySQL 支持；表较小、统计信息缺失或其他数据库时返回 None，由调用方回退为精确 COUNT
+
+        Returns:
+            估算行数或 None
+        """
+        if self.db.get_bind().dialect.name != "mysql":
+            return None
+        result = await self.db.execute(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+            ),
+            {"table_name": User.__tablename__},
+        )
+        estimate = result.scalar()
+        if estimate is None or estimate < _APPROX_COUNT_THRESHOLD:
+            return None
+        return int(estimate)
 
     async def create(self, user: User) -> User:
+        """
+        新增用户
+
+        用户名、邮箱的唯一性由数据库唯一索引保证；冲突时回滚并抛出 IntegrityError，
+        可通过 duplicate_field() 判断冲突字段
+        """
+        # created_at/updated_at 由应用侧生成，插入后对象上已有值，提交后无需 refresh
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
         return user
 
+    @staticmethod
+    def duplicate_field(exc: IntegrityError) -> Optional[str]:
+        """
+        根据唯一索引冲突异常判断冲突字段
+
+        MySQL: Duplicate entry 'x' for key 'sys_users.ix_sys_users_user_name'
+        SQLite: UNIQUE constraint failed: sys_users.user_name
+
+        Returns:
+            "user_name"、"email"，无法识别时返回 None
+        """
+        message = str(exc.orig)
+        match = _MYSQL_DUPLICATE_KEY_RE.search(message) or _SQLITE_UNIQUE_RE.search(message)
+        if match is None:
+            return None
+        key = match.group(1)
+        for field in ("user_name", "email"):
+            # 列名本身，或 SQLAlchemy 生成的唯一索引名 ix_sys_users_<列名>
+            if key == field or key == f"ix_{User.__tablename__}_{field}":
+                return field
+        return None
+
+    def _supports_update_returning(self) -> bool:
+        """
+        当前数据库是否支持 UPDATE ... RETURNING（PostgreSQL、SQLite 支持，MySQL/MariaDB 不支持）
+        """
+        return self.db.get_bind().dialect.update_returning
+
     async def update(self, user_id: int, obj_in: dict[str, Any]) -> Optional[User]:
-        await self.db.execute(
-            update(User).where(User.user_id == user_id).values(**obj_in)
-        )
+        stmt = update(User).where(User.user_id == user_id).values(**obj_in)
+        if self._supports_update_returning():
+            # 一次往返完成更新并取回更新后的行
+            result = await self.db.execute(
+                stmt.returning(User),
+                execution_options={"synchronize_session": "fetch"},
+            )
+            user = result.scalar_one_or_none()
+            await self.db.commit()
+            # 与 get_by_id 保持一致：已软删除的用户视为不存在
+            if user is not None and user.is_deleted:
+                return None
+            return user
+
+        await self.db.execute(stmt)
         await self.db.commit()
         return await self.get_by_id(user_id)
 
     async def delete(self, user_id: int) -> bool:
         # 软删除
-        result = await self.db.execute(
-            update(User).where(User.user_id == user_id).values(is_deleted=True)
-        )
+        stmt = update(User).where(User.user_id == user_id).values(is_deleted=True)
+        if self._supports_update_returning():
+            result = await self.db.execute(stmt.returning(User.user_id))
+            deleted = result.scalar_one_or_none() is not None
+            await self.db.commit()
+            return deleted
+
+        result = await self.db.execute(stmt)
         await self.db.commit()
-        # SQLAlchemy 异步执行返回的 result 对象中包含 rowcount
-        rowcount = getattr(result, "rowcount", 0)
-        return bool(rowcount)
+        return bool(result.rowcount)
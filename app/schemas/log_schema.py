@@ -1,9 +1,10 @@
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Any
 
-from pydantic import Field, field_validator, field_serializer
+from pydantic import Field, computed_field, field_validator
 
-from app.schemas.base_schema import BaseSchema
+from app.schemas.base_schema import BaseSchema, DateTimeStr
 
 
 class SysLogOut(BaseSchema):
@@ -20,19 +21,17 @@ class SysLogOut(BaseSchema):
     operation_status: str = Field(..., description="接口请求状态(success/failure)")
     response_status: str = Field(..., description="操作结果状态(success/failure)")
     response_result: Optional[str] = Field(None, description="返回结果(JSON格式)")
-    request_time: datetime = Field(..., description="请求时间")
+    request_time: DateTimeStr = Field(..., description="请求时间")
     duration: Optional[int] = Field(None, description="耗时(毫秒)")
     user_info: Optional[str] = Field(None, description="用户信息(JSON格式)")
     client_ip: Optional[str] = Field(None, description="客户端IP")
     user_agent: Optional[str] = Field(None, description="客户端User-Agent")
-    created_at: datetime = Field(..., description="创建时间")
-    
-    @field_serializer('request_time', 'created_at')
-    def serialize_datetime(self, value: datetime) -> str:
-        """将datetime对象格式化为YYYY-MM-DD HH:mm:ss格式"""
-        if value is None:
-            return None
-        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+    @computed_field(description="创建时间（即请求时间）")
+    @property
+    def created_at(self) -> DateTimeStr:
+        """日志表不再单独存储创建时间，保留该字段以兼容接口"""
+        return self.request_time
 
 
 class LogBatchDelete(BaseSchema):
@@ -75,24 +74,19 @@ class LogCleanupByTime(BaseSchema):
         if not isinstance(v, str):
             raise ValueError("时间格式必须是字符串")
 
-        # 尝试多种格式
-        formats = [
-            "%Y-%m-%d %H:%M:%S",  # 2025-12-29 21:45:06
-            "%Y-%m-%dT%H:%M:%S",  # 2025-12-29T21:45:06
-            "%Y-%m-%d %H:%M:%S.%f",  # 2025-12-29 21:45:06.123
-            "%Y-%m-%dT%H:%M:%S.%f",  # 2025-12-29T21:45:06.123
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(v, fmt)
-            except ValueError:
-                continue
-
-        # 如果所有格式都失败，尝试 Pydantic 的默认解析
-        try:
-            return datetime.fromisoformat(v)
-        except ValueError:
-            raise ValueError(
-                f"时间格式错误，支持格式：YYYY-MM-DD HH:MM:SS 或 YYYY-MM-DDTHH:MM:SS，实际值：{v}"
-            )
\ No newline at end of file
+        return _parse_datetime_str(v)
+
+
+@lru_cache(maxsize=1024)
+def _parse_datetime_str(v: str) -> datetime:
+    """
+    解析时间字符串（datetime 不可变，可安全缓存重复提交的时间值）
+
+    datetime.fromisoformat 为C实现，一次调用即可覆盖空格/T分隔与毫秒等格式
+    """
+    try:
+        return datetime.fromisoformat(v)
+    except ValueError:
+        raise ValueError(
+            f"时间格式错误，支持格式：YYYY-MM-DD HH:MM:SS 或 YYYY-MM-DDTHH:MM:SS，实际值：{v}"
+        ) from None
@@ -1,10 +1,9 @@
-from datetime import datetime
 from typing import Any, Optional
 
-from pydantic import EmailStr, Field, field_validator, field_serializer
+from pydantic import EmailStr, Field, field_validator
 
-from app.core.validator import ValidationRule, validate_rules
-from app.schemas.base_schema import BaseSchema
+from app.core.validator import ValidationRule, password_strength_error, validate_rules
+from app.schemas.base_schema import BaseSchema, DateTimeStr
 
 
 class UserBase(BaseSchema):
@@ -17,6 +16,18 @@ class UserBase(BaseSchema):
     full_name: Optional[str] = Field(None, max_length=100, description="全名")
 
 
+_USER_NAME_RULES = [
+    ValidationRule(required=True, message="请输入用户名"),
+    ValidationRule(min_len=3, message="用户名长度不能少于 3 个字符"),
+]
+
+_PASSWORD_RULES = [
+    ValidationRule(required=True, message="请输入密码"),
+    ValidationRule(min_len=8, message="密码长度至少8位"),
+    ValidationRule(max_len=128, message="密码长度不能超过128位"),
+]
+
+
 class UserCreate(UserBase):
     """
     用户创建 Schema
@@ -27,49 +38,18 @@ class UserCreate(UserBase):
     @field_validator("user_name")
     @classmethod
     def validate_user_name(cls, v: str) -> Any:
-        rules = [
-            ValidationRule(required=True, message="请输入用户名"),
-            ValidationRule(min_len=3, message="用户名长度不能少于 3 个字符"),
-        ]
-        return validate_rules(v, rules)
+        return validate_rules(v, _USER_NAME_RULES)
 
     @field_validator("password")
     @classmethod
     def validate_password(cls, v: str) -> Any:
-        import re
-
-        rules = [
-            ValidationRule(required=True, message="请输入密码"),
-            ValidationRule(min_len=8, message="密码长度至少8位"),
-            ValidationRule(max_len=128, message="密码长度不能超过128位"),
-        ]
-
         # 基础规则验证
-        v = validate_rules(v, rules)
+        v = validate_rules(v, _PASSWORD_RULES)
 
         # 密码强度验证
-        if not any(c.isupper() for c in v):
-            raise ValueError("密码必须包含至少一个大写字母")
-        if not any(c.islower() for c in v):
-            raise ValueError("密码必须包含至少一个小写字母")
-        if not any(c.isdigit() for c in v):
-            raise ValueError("密码必须包含至少一个数字")
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
-            raise ValueError("密码必须包含至少一个特殊字符")
-
-        # 检查常见弱密码模式（使用更精确的匹配）
-        weak_patterns = [
-            r"^123456",
-            r"^password",
-            r"^admin",
-            r"^qwerty",
-            r"^abc123",
-            r"^111111",
-            r"^000000",
-        ]
-        for pattern in weak_patterns:
-            if re.search(pattern, v, re.IGNORECASE):
-                raise ValueError("密码不能包含常见的弱密码模式")
+        error = password_strength_error(v)
+        if error:
+            raise ValueError(error)
 
         return v
 
@@ -83,6 +63,35 @@ class UserUpdate(BaseSchema):
     full_name: Optional[str] = Field(None, max_length=100, description="全名")
 
 
+_ADMIN_USER_TYPE = 1
+
+# 对非管理员屏蔽管理员信息时覆盖的字段（伪装成普通用户）
+_MASKED_ADMIN_FIELDS = {
+    'email': None,
+    'full_name': '系统管理员',
+    'is_active': True,
+    'user_type': 9,
+}
+
+
+def _user_out_fields(user: Any) -> dict[str, Any]:
+    """
+    从用户对象（ORM 实例或查询行）取出 UserOut 的字段
+
+    数据来自数据库，构造 UserOut 时使用 model_construct 跳过字段校验
+    """
+    return {
+        'user_id': user.user_id,
+        'user_name': user.user_name,
+        'email': user.email,
+        'full_name': user.full_name,
+        'is_active': user.is_active,
+        'created_at': user.created_at,
+        'updated_at': user.updated_at,
+        'user_type': user.user_type,
+    }
+
+
 class UserOut(UserBase):
     """
     用户详情输出 Schema
@@ -91,17 +100,10 @@ class UserOut(UserBase):
     user_name: str
     user_id: int
     is_active: bool
-    created_at: datetime
-    updated_at: datetime
+    created_at: DateTimeStr
+    updated_at: DateTimeStr
     user_type: int
     
-    @field_serializer('created_at', 'updated_at')
-    def serialize_datetime(self, value: datetime) -> str:
-        """将datetime对象格式化为YYYY-MM-DD HH:mm:ss格式"""
-        if value is None:
-            return None
-        return value.strftime("%Y-%m-%d %H:%M:%S")
-    
     @classmethod
     def from_user_with_permission(cls, user: 'User', current_user: 'User' = None) -> 'UserOut':
         """
@@ -114,42 +116,62 @@ class UserOut(UserBase):
         Returns:
             根据权限过滤后的用户输出对象
         """
-        # 创建基础的用户输出对象
-        user_data = {
-            'user_id': user.user_id,
-            'user_name': user.user_name,
-            'email': user.email,
-            'full_name': user.full_name,
-            'is_active': user.is_active,
-            'created_at': user.created_at,
-            'updated_at': user.updated_at,
-            'user_type': user.user_type
-        }
-        
-        # 权限控制逻辑
-        if current_user is None:
-            # 没有当前用户信息，隐藏所有敏感信息
-            if user.user_type == 1:  # 管理员用户
-                user_data['email'] = None
-                user_data['full_name'] = '系统管理员'
-                user_data['is_active'] = True
-                user_data['user_type'] = 9  # 伪装成普通用户
-        elif current_user.user_type != 1:
-            # 普通用户权限控制
-            if user.user_type == 1:
-                # 普通用户看不到管理员的详细信息
-                user_data['email'] = None
-                user_data['full_name'] = '系统管理员'
-                user_data['is_active'] = True
-                user_data['user_type'] = 9  # 伪装成普通用户
-            elif user.user_id != current_user.user_id:
-                # 普通用户看不到其他普通用户的敏感信息
-                user_data['email'] = None
-                # 保留基本用户名和状态信息
-                user_data['full_name'] = user.full_name or '用户' + str(user.user_id)
         # 管理员用户可以看到所有完整信息
+        if current_user is not None and current_user.user_type == _ADMIN_USER_TYPE:
+            return cls.from_user_fast(user)
+
+        if user.user_type == _ADMIN_USER_TYPE:
+            # 普通用户（或未知用户）看不到管理员的详细信息，伪装成普通用户
+            return cls.model_construct(**{**_user_out_fields(user), **_MASKED_ADMIN_FIELDS})
+
+        data = _user_out_fields(user)
+        if current_user is not None and user.user_id != current_user.user_id:
+            # 普通用户看不到其他普通用户的敏感信息，保留基本用户名和状态信息
+            data['email'] = None
+            data['full_name'] = user.full_name or '用户' + str(user.user_id)
+        return cls.model_construct(**data)
+    
+    @classmethod
+    def from_user_fast(cls, user: 'User') -> 'UserOut':
+        """
+        管理员视角的用户输出对象（不做任何字段屏蔽）
         
-        return cls.model_validate(user_data)
+        Args:
+            user: 要输出的用户对象
+            
+        Returns:
+            完整的用户输出对象
+        """
+        return cls.model_construct(**_user_out_fields(user))
+    
+    @classmethod
+    def from_user_masked(cls, user: 'User', viewer_id: Optional[int] = None) -> 'UserOut':
+        """
+        普通用户视角的用户输出对象（屏蔽管理员信息和他人邮箱）
+        
+        与 from_user_with_permission 中普通用户分支的规则一致
+        
+        Args:
+            user: 要输出的用户对象
+            viewer_id: 当前访问用户的ID
+            
+        Returns:
+            屏蔽敏感信息后的用户输出对象
+        """
+        if user.user_type == _ADMIN_USER_TYPE:
+            return cls.model_construct(**{**_user_out_fields(user), **_MASKED_ADMIN_FIELDS})
+        if user.user_id != viewer_id:
+            return cls.model_construct(
+                user_id=user.user_id,
+                user_name=user.user_name,
+                email=None,
+                full_name=user.full_name or '用户' + str(user.user_id),
+                is_active=user.is_active,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+                user_type=user.user_type,
+            )
+        return cls.from_user_fast(user)
     
     @classmethod
     def create_safe_user_output(cls, user: 'User', current_user: 'User' = None) -> dict[str, Any]:
@@ -1,6 +1,8 @@
+import base64
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AppError
@@ -16,27 +18,14 @@ class SysLogService:
     def __init__(self, db: AsyncSession):
         self.repo = SysLogRepository(db)
 
-    async def get_logs(self, page: int, page_size: int, **filters) -> Dict[str, Any]:
+    @staticmethod
+    def _normalize_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
         """
-        获取日志列表
+        校验并整理日志列表的过滤条件（只保留有值的条件，时间字符串转为datetime）
 
-        Args:
-            page: 页码
-            page_size: 每页数量
-            **filters: 过滤条件
-
-        Returns:
-            分页数据
+        Raises:
+            AppError: 时间格式错误或时间范围不合法
         """
-        # 参数校验
-        if page < 1:
-            page = 1
-        if page_size < 1:
-            page_size = 10
-        if page_size > 100:
-            page_size = 100
-
-        # 构建过滤条件
         filter_dict = {}
 
         if filters.get("request_url"):
@@ -73,8 +62,59 @@ class SysLogService:
             if filter_dict["start_time"] > filter_dict["end_time"]:
                 raise AppError("开始时间不能晚于结束时间")
 
-        items, total = await self.repo.get_list(page, page_size, filter_dict)
-        total_page = (total + page_size - 1) // page_size
+        return filter_dict
+
+    @staticmethod
+    def _encode_cursor(cursor: Optional[Tuple[datetime, int]]) -> Optional[str]:
+        """将 (request_time, id) 编码为对客户端不透明的游标字符串"""
+        if cursor is None:
+            return None
+        raw = orjson.dumps([cursor[0].isoformat(), cursor[1]])
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        """解析游标字符串"""
+        if not cursor:
+            return None
+        try:
+            request_time, log_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+            return datetime.fromisoformat(request_time), int(log_id)
+        except (ValueError, TypeError):
+            raise AppError("分页游标无效")
+
+    async def get_logs(
+        self, page: int, page_size: int, with_count: bool = False, **filters
+    ) -> Dict[str, Any]:
+        """
+        获取日志列表
+
+        默认不查询总数（countless 模式），with_count 为 True 时才额外查询总数与总页数
+
+        Args:
+            page: 页码
+            page_size: 每页数量
+            with_count: 是否查询总数
+            **filters: 过滤条件
+
+        Returns:
+            分页数据
+        """
+        # 参数校验
+        if page < 1:
+            page = 1
+        if page_size < 1:
+            page_size = 10
+        if page_size > 100:
+            page_size = 100
+
+        filter_dict = self._normalize_filters(filters)
+
+        items, has_more = await self.repo.get_list(page, page_size, filter_dict)
+        total = total_page = None
+        if with_count:
+            total = await self.repo.count(filter_dict)
+            total_page = (total + page_size - 1) // page_size
 
         return {
             "records": items,
@@ -82,6 +122,34 @@ class SysLogService:
             "page": page,
             "page_size": page_size,
             "total_page": total_page,
+            "has_more": has_more,
+        }
+
+    async def get_logs_by_cursor(
+        self, cursor: Optional[str], page_size: int, **filters
+    ) -> Dict[str, Any]:
+        """
+        游标分页获取日志列表（深翻页时耗时不随页数增长）
+
+        Args:
+            cursor: 上一页返回的游标，为空时获取第一页
+            page_size: 每页数量
+            **filters: 过滤条件
+
+        Returns:
+            游标分页数据
+        """
+        page_size = min(max(page_size, 1), 100)
+        filter_dict = self._normalize_filters(filters)
+
+        items, next_cursor = await self.repo.get_list_keyset(
+            self._decode_cursor(cursor), page_size, filter_dict
+        )
+
+        return {
+            "records": items,
+            "page_size": page_size,
+            "next_cursor": self._encode_cursor(next_cursor),
         }
 
     async def batch_delete_logs(self, obj_in: LogBatchDelete) -> int:
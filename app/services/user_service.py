@@ -1,10 +1,14 @@
-import re
+import asyncio
+import base64
 from typing import Any, Optional
 
-from passlib.hash import pbkdf2_sha256
+import orjson
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AppError
+from app.core.security import get_password_hash, verify_password_cached
+from app.core.validator import password_strength_error
 from app.models.user_model import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user_schema import UserCreate, UserUpdate
@@ -17,93 +21,149 @@ class UserService:
 
     def __init__(self, db: AsyncSession):
         self.repo = UserRepository(db)
+        # 请求内的用户查询缓存：服务实例按请求创建，权限校验与业务操作重复查询同一用户时只查一次
+        self._users: dict[int, User] = {}
 
     def _hash_password(self, password: str) -> str:
-        """使用PBKDF2进行安全密码哈希"""
-        return pbkdf2_sha256.hash(password, rounds=100000)
+        """使用bcrypt进行安全密码哈希"""
+        return get_password_hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """验证密码"""
-        return pbkdf2_sha256.verify(plain_password, hashed_password)
+        """验证密码（命中短期缓存时跳过KDF计算）"""
+        return verify_password_cached(plain_password, hashed_password)
 
     def _validate_password_strength(self, password: str) -> None:
         """验证密码强度"""
         if len(password) < 8:
             raise AppError("密码长度至少8位")
-        if not any(c.isupper() for c in password):
-            raise AppError("密码必须包含至少一个大写字母")
-        if not any(c.islower() for c in password):
-            raise AppError("密码必须包含至少一个小写字母")
-        if not any(c.isdigit() for c in password):
-            raise AppError("密码必须包含至少一个数字")
-        # 检查是否包含特殊字符
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            raise AppError("密码必须包含至少一个特殊字符")
-        # 检查是否包含常见弱密码模式（使用更精确的匹配）
-        weak_patterns = [
-            r"^123456",
-            r"^password",
-            r"^admin",
-            r"^qwerty",
-            r"^abc123",
-            r"^111111",
-            r"^000000",
-        ]
-        for pattern in weak_patterns:
-            if re.search(pattern, password, re.IGNORECASE):
-                raise AppError("密码不能包含常见的弱密码模式")
+        error = password_strength_error(password)
+        if error:
+            raise AppError(error)
 
     async def get_user(self, user_id: int) -> User:
+        user = self._users.get(user_id)
+        if user is not None:
+            return user
         user = await self.repo.get_by_id(user_id)
         if not user:
             raise AppError(f"用户 ID {user_id} 不存在")
+        self._users[user_id] = user
         return user
 
-    async def list_users(self, page: int, page_size: int, current_user: Optional[User] = None) -> dict[str, Any]:
-        items, total = await self.repo.get_list(page, page_size, current_user)
-        total_page = (total + page_size - 1) // page_size
+    async def list_users(
+        self,
+        page: int,
+        page_size: int,
+        current_user: Optional[User] = None,
+        with_count: bool = False,
+    ) -> dict[str, Any]:
+        """
+        分页获取用户列表
+
+        默认不查询总数（countless 模式），with_count 为 True 时才同时返回总数与总页数；
+        管理员查看大表的非首页时使用表统计信息中的估算值（total_approx 为 True，包含已软删除的用户），
+        其余情况在列表查询中用窗口函数精确统计。普通用户的列表过滤了管理员，与整表行数不对应，不使用估算值
+        """
+        total = total_page = None
+        if with_count and page > 1 and (current_user is None or current_user.user_type == 1):
+            total = await self.repo.approx_count()
+        total_approx = total is not None
+        if with_count and total is None:
+            items, total = await self.repo.get_list_with_total(page, page_size, current_user)
+            has_more = page * page_size < total
+        else:
+            items, has_more = await self.repo.get_list(page, page_size, current_user)
+        if with_count:
+            total_page = (total + page_size - 1) // page_size
         return {
             "records": items,
             "total": total,
             "page": page,
             "page_size": page_size,
             "total_page": total_page,
+            "total_approx": total_approx,
+            "has_more": has_more,
+        }
+
+    @staticmethod
+    def _encode_cursor(cursor: Optional[int]) -> Optional[str]:
+        """将用户ID编码为对客户端不透明的游标字符串"""
+        if cursor is None:
+            return None
+        return base64.urlsafe_b64encode(orjson.dumps([cursor])).decode("ascii")
+
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Optional[int]:
+        """解析游标字符串"""
+        if not cursor:
+            return None
+        try:
+            (user_id,) = orjson.loads(base64.urlsafe_b64decode(cursor))
+            return int(user_id)
+        except (ValueError, TypeError):
+            raise AppError("分页游标无效")
+
+    async def list_users_by_cursor(
+        self,
+        cursor: Optional[str],
+        page_size: int,
+        current_user: Optional[User] = None,
+    ) -> dict[str, Any]:
+        """
+        游标分页获取用户列表（深翻页时耗时不随页数增长）
+        """
+        page_size = min(max(page_size, 1), 100)
+        items, next_cursor = await self.repo.get_list_keyset(
+            self._decode_cursor(cursor), page_size, current_user
+        )
+        return {
+            "records": items,
+            "page_size": page_size,
+            "next_cursor": self._encode_cursor(next_cursor),
         }
 
     async def create_user(self, obj_in: UserCreate) -> User:
         # 1. 验证密码强度
         self._validate_password_strength(obj_in.password)
 
-        # 2. 检查用户名唯一性
-        existing_user = await self.repo.get_by_user_name(obj_in.user_name)
-        if existing_user:
-            raise AppError(f"用户名 {obj_in.user_name} 已存在")
-
-        # 3. 检查邮箱唯一性 (如果提供了邮箱)
-        if obj_in.email:
-            existing_email = await self.repo.get_by_email(obj_in.email)
-            if existing_email:
-                raise AppError(f"邮箱 {obj_in.email} 已被注册")
-
         user_data = obj_in.model_dump()
         password = user_data.pop("password")
-        user_data["hashed_password"] = self._hash_password(password)
+        # KDF 计算耗时数十毫秒，放到线程池执行，避免阻塞事件循环
+        user_data["hashed_password"] = await asyncio.to_thread(self._hash_password, password)
         user_data["user_type"] = 9  # 强制设置为普通用户
 
+        # 2. 直接插入，用户名和邮箱的唯一性由数据库唯一索引保证（无预查询，无并发竞态）
         db_user = User(**user_data)
-        return await self.repo.create(db_user)
+        try:
+            db_user = await self.repo.create(db_user)
+        except IntegrityError as e:
+            field = self.repo.duplicate_field(e)
+            if field == "user_name":
+                raise AppError(f"用户名 {obj_in.user_name} 已存在")
+            if field == "email":
+                raise AppError(f"邮箱 {obj_in.email} 已被注册")
+            raise
+        self.repo.invalidate_user_name(db_user.user_name)
+        return db_user
 
     async def update_user(self, user_id: int, obj_in: UserUpdate) -> User:
-        await self.get_user(user_id)  # 确保存在
+        # 权限校验（can_update_user）已加载过目标用户时直接命中请求内缓存，否则只做存在性查询
+        if user_id not in self._users and not await self.repo.exists(user_id):
+            raise AppError(f"用户 ID {user_id} 不存在")
         update_data = obj_in.model_dump(exclude_unset=True)
         result = await self.repo.update(user_id, update_data)
+        self._users.pop(user_id, None)
         if result is None:
             raise AppError(f"用户 ID {user_id} 更新失败")
+        self.repo.invalidate_user_name(result.user_name)
         return result
 
     async def delete_user(self, user_id: int) -> bool:
-        await self.get_user(user_id)  # 确保存在
-        return await self.repo.delete(user_id)
+        user = await self.get_user(user_id)  # 确保存在
+        deleted = await self.repo.delete(user_id)
+        self._users.pop(user_id, None)
+        self.repo.invalidate_user_name(user.user_name)
+        return deleted
 
     async def can_delete_user(self, current_user: User, target_user_id: int) -> bool:
         """检查当前用户是否可以删除目标用户"""
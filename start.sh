@@ -41,7 +41,9 @@ echo "🚀 Using uv to start FastAPI in $APP_ENV mode on port $APP_PORT..."
 # 使用 uv 启动 uvicorn
 # --reload 仅在非生产环境下开启
 if [ "$APP_ENV" == "pro" ]; then
-    uv run uvicorn app.main:app --host 0.0.0.0 --port $APP_PORT
+    uv run uvicorn app.main:app --host 0.0.0.0 --port $APP_PORT \
+        --loop uvloop --http httptools --workers ${WORKERS:-1}
 else
-    uv run uvicorn app.main:app --host 127.0.0.1 --port $APP_PORT --reload
+    uv run uvicorn app.main:app --host 127.0.0.1 --port $APP_PORT \
+        --loop uvloop --http httptools --reload
 fi
@@ -1,6 +1,8 @@
 import pytest
+import pytest_asyncio
 import asyncio
 from typing import AsyncGenerator, Generator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.db.session import get_db
@@ -19,11 +21,35 @@ test_engine = create_async_engine(
     poolclass=StaticPool,
 )
 
+
+@event.listens_for(test_engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    """
+    测试库连接设置
+
+    - 关闭驱动自身的隐式事务管理，由 SQLAlchemy 发出 BEGIN，SAVEPOINT 才能正常工作
+    - 临时表放内存、加大页缓存（内存库不支持 WAL，日志模式固定为 memory）
+    """
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
+
+
+@event.listens_for(test_engine.sync_engine, "begin")
+def _on_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 # 创建测试会话工厂
 TestSessionLocal = async_sessionmaker(
     test_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# 表结构只创建一次，各测试的数据通过事务回滚清理
+_schema_created = False
+
 fake = Faker("zh_CN")
 
 
@@ -35,17 +61,42 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """清空进程内缓存，避免测试之间互相影响"""
+    from app.api.auth_router import _ME_CACHE
+    from app.core.security import _verify_cache
+    from app.repositories.user_repository import _USER_NAME_CACHE
+
+    for c in (_ME_CACHE, _verify_cache, _USER_NAME_CACHE):
+        c.clear()
+    yield
+
+
+@pytest_asyncio.fixture(scope="function")
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
-    """创建测试数据库会话"""
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    async with TestSessionLocal() as session:
-        yield session
-    
-    async with test_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    """
+    创建测试数据库会话
+
+    会话绑定在外层事务上，被测代码中的 commit 只提交到 SAVEPOINT，
+    测试结束时回滚外层事务，无需每个测试重建表结构
+    """
+    global _schema_created
+    if not _schema_created:
+        async with test_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_created = True
+
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        session = AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await trans.rollback()
 
 
 @pytest.fixture(scope="function")
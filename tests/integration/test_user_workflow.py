@@ -43,8 +43,6 @@ class TestUserWorkflow:
         )
 
         # 模拟repository方法
-        service.repo.get_by_user_name = AsyncMock(return_value=None)
-        service.repo.get_by_email = AsyncMock(return_value=None)
         service.repo.create = AsyncMock()
 
         # 执行用户创建
@@ -94,7 +92,7 @@ class TestEndToEndUserFlow:
         assert retrieved_user.user_name == "lifecycleuser"
         
         # 3. 查询用户列表
-        user_list = await service.list_users(1, 10)
+        user_list = await service.list_users(1, 10, with_count=True)
         assert len(user_list["records"]) >= 1
         assert user_list["total"] >= 1
         
@@ -138,11 +136,12 @@ class TestEndToEndUserFlow:
             created_users.append(user)
         
         # 测试分页查询
-        page1 = await service.list_users(1, 2)
+        page1 = await service.list_users(1, 2, with_count=True)
         assert len(page1["records"]) == 2
+        assert page1["has_more"] is True
         assert page1["total_page"] == 2
         
-        page2 = await service.list_users(2, 2)
+        page2 = await service.list_users(2, 2, with_count=True)
         assert len(page2["records"]) == 1
         assert page2["total_page"] == 2
         
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.cache_keys import (
+    invalidate_user_detail,
+    user_detail_key_builder,
+    users_list_key_builder,
+)
+from app.schemas.base_schema import PaginationParams
+
+
+class TestCacheKeys:
+    """接口缓存key测试"""
+
+    def test_user_detail_key_scoped_by_viewer(self):
+        """测试用户详情缓存key按查看者权限区分"""
+        admin = Mock(user_id=1, user_type=1)
+        normal = Mock(user_id=2, user_type=9)
+
+        admin_key = user_detail_key_builder(
+            None, "fastapi-cache:user_detail", kwargs={"user_id": 2, "current_user": admin}
+        )
+        self_key = user_detail_key_builder(
+            None, "fastapi-cache:user_detail", kwargs={"user_id": 2, "current_user": normal}
+        )
+
+        assert admin_key == "fastapi-cache:user_detail:2:admin"
+        assert self_key == "fastapi-cache:user_detail:2:2"
+
+    @pytest.mark.asyncio
+    async def test_users_list_key_contains_version(self):
+        """测试用户列表缓存key包含版本号"""
+        backend = Mock()
+        backend.redis.get = AsyncMock(return_value="3")
+        normal = Mock(user_id=5, user_type=9)
+
+        with patch("app.core.cache_keys.FastAPICache.get_backend", return_value=backend):
+            key = await users_list_key_builder(
+                None,
+                "fastapi-cache:users_list",
+                kwargs={
+                    "pagination": PaginationParams(page=2, page_size=20),
+                    "current_user": normal,
+                },
+            )
+
+        assert key == "fastapi-cache:users_list:v3:2:20:0:5"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user_detail_deletes_target_keys(self):
+        """测试用户详情缓存定向删除"""
+        backend = Mock()
+        backend.redis.delete = AsyncMock()
+
+        with patch("app.core.cache_keys.FastAPICache.get_backend", return_value=backend), \
+                patch("app.core.cache_keys.FastAPICache.get_prefix", return_value="fastapi-cache"):
+            await invalidate_user_detail(7)
+
+        backend.redis.delete.assert_awaited_once_with(
+            "fastapi-cache:user_detail:7:admin", "fastapi-cache:user_detail:7:7"
+        )
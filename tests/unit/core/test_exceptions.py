@@ -249,16 +249,28 @@ class TestGlobalExceptionHandler:
         try:
             raise ValueError("Test error with traceback")
         except Exception as unknown_error:
-            with patch('builtins.print') as mock_print:
+            with patch('app.core.exceptions.logger') as mock_logger:
                 response = await global_exception_handler(mock_request, unknown_error)
             
             assert response.status_code == 500
-            mock_print.assert_called_once()
+            mock_logger.exception.assert_called_once()
             
-            # 验证异常信息被正确捕获和打印
-            call_args = str(mock_print.call_args)
-            assert "系统异常" in call_args
-            assert "Test error with traceback" in call_args
+            # 验证异常信息及堆栈被正确记录
+            call_args = mock_logger.exception.call_args
+            assert call_args.args[0] == "系统异常"
+            assert call_args.kwargs["err"] == "Test error with traceback"
+            assert call_args.kwargs["exc_info"] is unknown_error
+
+    @pytest.mark.asyncio
+    async def test_handle_unknown_exception_without_debug(self, mock_request):
+        """测试非调试模式下未知异常同样记录堆栈"""
+        with patch('app.core.exceptions.logger') as mock_logger, \
+                patch('app.core.config.settings.DEBUG', False):
+            response = await global_exception_handler(mock_request, ValueError("boom"))
+
+        assert response.status_code == 500
+        mock_logger.exception.assert_called_once()
+        assert mock_logger.exception.call_args.kwargs["err_type"] == "ValueError"
 
     @pytest.mark.asyncio
     async def test_response_format_consistency(self, mock_request):
@@ -0,0 +1,203 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.schema import CreateIndex
+
+from app.core.exceptions import AppError
+from app.models.log_model import SysLog
+from app.repositories.log_repository import SysLogRepository, set_fulltext_columns
+from app.services.log_service import SysLogService
+
+
+def _log_row(request_time: datetime, **overrides) -> dict:
+    row = {
+        "request_url": "/api/users",
+        "request_method": "GET",
+        "visit_module": "用户管理",
+        "response_status": "success",
+        "operation_status": "success",
+        "client_ip": "127.0.0.1",
+        "request_time": request_time,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestSysLogRepositoryKeyset:
+    """日志游标分页测试类"""
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_are_disjoint_and_ordered(self, db_session):
+        """测试游标分页按时间倒序返回且页间不重复（含相同时间戳）"""
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        # 每两条共用一个时间戳，验证 id 作为次级排序键
+        rows = [_log_row(base + timedelta(seconds=i // 2)) for i in range(7)]
+        repository = SysLogRepository(db_session)
+        await repository.bulk_create(rows)
+
+        seen = []
+        cursor = None
+        while True:
+            logs, cursor = await repository.get_list_keyset(cursor, 3)
+            seen.extend((log.request_time, log.id) for log in logs)
+            if cursor is None:
+                break
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+        assert seen == sorted(seen, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_keyset_applies_filters(self, db_session):
+        """测试游标分页应用过滤条件"""
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        repository = SysLogRepository(db_session)
+        await repository.bulk_create([
+            _log_row(base, request_method="GET"),
+            _log_row(base + timedelta(seconds=1), request_method="POST"),
+        ])
+
+        logs, cursor = await repository.get_list_keyset(None, 10, {"request_method": "POST"})
+
+        assert [log.request_method for log in logs] == ["POST"]
+        assert cursor is None
+
+
+class TestSysLogRepositoryOffset:
+    """日志 OFFSET 分页测试类"""
+
+    @pytest.mark.asyncio
+    async def test_offset_list_reports_has_more_without_count(self, db_session):
+        """测试 OFFSET 分页通过多取一条判断是否还有下一页，总数单独查询"""
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        repository = SysLogRepository(db_session)
+        await repository.bulk_create([_log_row(base + timedelta(seconds=i)) for i in range(3)])
+
+        first, first_more = await repository.get_list(1, 2)
+        last, last_more = await repository.get_list(2, 2)
+
+        assert len(first) == 2 and first_more is True
+        assert len(last) == 1 and last_more is False
+        assert await repository.count() == 3
+        assert await repository.count({"request_method": "POST"}) == 0
+
+    @pytest.mark.asyncio
+    async def test_offset_pages_stable_for_equal_timestamps(self, db_session):
+        """测试请求时间相同时按 id 倒序，翻页不重复"""
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        repository = SysLogRepository(db_session)
+        await repository.bulk_create([_log_row(base) for _ in range(4)])
+
+        first, _ = await repository.get_list(1, 2)
+        second, _ = await repository.get_list(2, 2)
+
+        ids = [log.id for log in first + second]
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 4
+
+
+class TestSysLogRepositoryDelete:
+    """日志删除测试类"""
+
+    @pytest.mark.asyncio
+    async def test_batch_delete_in_chunks(self, db_session):
+        """测试按ID分块删除，返回删除总数"""
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        repository = SysLogRepository(db_session)
+        await repository.bulk_create([_log_row(base + timedelta(seconds=i)) for i in range(5)])
+        logs, _ = await repository.get_list(1, 10)
+
+        with patch("app.repositories.log_repository._DELETE_ID_CHUNK_SIZE", 2):
+            deleted = await repository.batch_delete([log.id for log in logs[:4]] + [9999])
+
+        assert deleted == 4
+        assert await repository.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_by_time_range(self, db_session):
+        """测试按时间范围删除"""
+        base = datetime(2024, 1, 1, 12, 0, 0)
+        repository = SysLogRepository(db_session)
+        await repository.bulk_create([_log_row(base + timedelta(days=i)) for i in range(4)])
+
+        deleted = await repository.delete_by_time_range(end_time=base + timedelta(days=1))
+
+        assert deleted == 2
+        assert await repository.count() == 2
+
+
+class TestSysLogRepositorySubstringFilter:
+    """日志模糊筛选测试类"""
+
+    @staticmethod
+    def _compile(dialect, filters: dict) -> str:
+        session = MagicMock()
+        session.get_bind.return_value.dialect = dialect
+        conditions = SysLogRepository(session)._build_conditions(filters)
+        return " AND ".join(
+            str(c.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            for c in conditions
+        )
+
+    @pytest.fixture
+    def fulltext_columns(self):
+        """登记全文索引列，测试结束后恢复为未登记"""
+        set_fulltext_columns({"request_url", "visit_module"})
+        yield
+        set_fulltext_columns(())
+
+    def test_mysql_uses_fulltext_match(self, fulltext_columns):
+        """测试 MySQL 下URL/模块筛选使用全文索引匹配"""
+        sql = self._compile(mysql.dialect(), {"request_url": "/api/users", "visit_module": "用户"})
+
+        assert "MATCH (sys_log.request_url) AGAINST" in sql
+        assert "MATCH (sys_log.visit_module) AGAINST" in sql
+        assert "LIKE" not in sql
+
+    def test_mysql_without_fulltext_index_uses_like(self):
+        """测试存量表未建全文索引时 MySQL 下回退为 LIKE（避免 MATCH 报 1191）"""
+        set_fulltext_columns({"request_url"})
+        try:
+            sql = self._compile(
+                mysql.dialect(), {"request_url": "/api/users", "visit_module": "用户"}
+            )
+        finally:
+            set_fulltext_columns(())
+
+        assert "MATCH (sys_log.request_url) AGAINST" in sql
+        assert "sys_log.visit_module LIKE" in sql
+
+        assert "MATCH" not in self._compile(mysql.dialect(), {"request_url": "/api/users"})
+
+    def test_short_keyword_and_other_dialects_use_like(self, fulltext_columns):
+        """测试关键字过短或非 MySQL 数据库时回退为 LIKE"""
+        assert "LIKE" in self._compile(mysql.dialect(), {"visit_module": "用"})
+        assert "LIKE" in self._compile(sqlite.dialect(), {"request_url": "/api/users"})
+
+    def test_fulltext_index_ddl_on_mysql(self):
+        """测试全文索引在 MySQL 下使用 ngram 分词"""
+        index = next(i for i in SysLog.__table__.indexes if i.name == "ft_log_request_url")
+
+        ddl = str(CreateIndex(index).compile(dialect=mysql.dialect()))
+
+        assert ddl.startswith("CREATE FULLTEXT INDEX")
+        assert "WITH PARSER ngram" in ddl
+
+
+class TestSysLogServiceCursor:
+    """日志游标编解码测试类"""
+
+    def test_cursor_round_trip(self):
+        """测试游标编码后可还原"""
+        cursor = (datetime(2024, 1, 1, 12, 0, 0), 42)
+
+        token = SysLogService._encode_cursor(cursor)
+
+        assert SysLogService._decode_cursor(token) == cursor
+
+    def test_invalid_cursor_raises(self):
+        """测试非法游标抛出业务异常"""
+        with pytest.raises(AppError):
+            SysLogService._decode_cursor("not-a-cursor")
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from app.repositories.user_repository import UserRepository
 from app.models.user_model import User
 from tests.conftest import UserFactory
@@ -93,6 +94,32 @@ class TestUserRepository:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_get_by_user_name_cached(self, user_repository, mock_db_session, mock_user):
+        """测试用户名查询缓存命中与失效"""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.first.return_value = mock_user
+        mock_db_session.execute.return_value = mock_result
+
+        first = await user_repository.get_by_user_name_cached(mock_user.user_name)
+        second = await user_repository.get_by_user_name_cached(mock_user.user_name)
+
+        assert first is mock_user and second is mock_user
+        mock_db_session.execute.assert_called_once()
+
+        UserRepository.invalidate_user_name(mock_user.user_name)
+        await user_repository.get_by_user_name_cached(mock_user.user_name)
+        assert mock_db_session.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exists(self, user_repository, mock_db_session):
+        """测试用户存在性检查只返回布尔值"""
+        mock_db_session.scalar = AsyncMock(return_value=True)
+        assert await user_repository.exists(1) is True
+
+        mock_db_session.scalar = AsyncMock(return_value=False)
+        assert await user_repository.exists(999) is False
+
     @pytest.mark.asyncio
     async def test_get_by_email_existing(self, user_repository, mock_db_session, mock_user):
         """测试根据邮箱获取存在的用户"""
@@ -119,27 +146,66 @@ class TestUserRepository:
     @pytest.mark.asyncio
     async def test_get_list_normal_pagination(self, user_repository, mock_db_session):
         """测试正常分页查询"""
-        # 模拟用户列表
-        mock_users = [UserFactory.create_user_model(id=i) for i in range(1, 6)]
-        
-        # 模拟总数查询结果
-        count_result = MagicMock()
-        count_result.scalar.return_value = 25  # 总数25条
+        # 模拟用户列表（多取一条用于判断是否有下一页）
+        mock_users = [UserFactory.create_user_model(id=i) for i in range(1, 7)]
         
         # 模拟列表查询结果
         list_result = MagicMock()
-        list_result.scalars.return_value.all.return_value = mock_users
-        
-        # 顺序返回不同的结果
-        mock_db_session.execute.side_effect = [count_result, list_result]
+        list_result.all.return_value = mock_users
+        mock_db_session.execute.return_value = list_result
 
         # 执行测试
-        items, total = await user_repository.get_list(page=1, page_size=5)
+        items, has_more = await user_repository.get_list(page=1, page_size=5)
 
-        # 验证结果
+        # 验证结果：只返回一页数据，且不再执行总数查询
         assert len(items) == 5
+        assert has_more is True
+        assert mock_db_session.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_count(self, user_repository, mock_db_session):
+        """测试单独查询用户总数"""
+        count_result = MagicMock()
+        count_result.scalar.return_value = 25
+        mock_db_session.execute.return_value = count_result
+
+        total = await user_repository.count()
+
         assert total == 25
-        assert mock_db_session.execute.call_count == 2
+        mock_db_session.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_list_with_total_single_query(self, user_repository, mock_db_session):
+        """测试列表与总数通过窗口函数一次查询取回"""
+        rows = [MagicMock(user_id=i, _total=25) for i in range(1, 11)]
+        list_result = MagicMock()
+        list_result.all.return_value = rows
+        mock_db_session.execute.return_value = list_result
+
+        items, total = await user_repository.get_list_with_total(page=1, page_size=10)
+
+        assert items == rows
+        assert total == 25
+        mock_db_session.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_list_keyset(self, user_repository, mock_db_session):
+        """测试游标分页：多取一条判断是否有下一页，下一页游标为本页最后一个用户ID"""
+        rows = [MagicMock(user_id=i) for i in range(10, 5, -1)]
+        list_result = MagicMock()
+        list_result.all.return_value = rows
+        mock_db_session.execute.return_value = list_result
+
+        items, cursor = await user_repository.get_list_keyset(11, 4)
+
+        assert [item.user_id for item in items] == [10, 9, 8, 7]
+        assert cursor == 7
+
+        list_result.all.return_value = rows[:3]
+        items, cursor = await user_repository.get_list_keyset(11, 4)
+
+        assert len(items) == 3
+        assert cursor is None
 
     @pytest.mark.asyncio
     async def test_get_list_edge_cases(self, user_repository, mock_db_session):
@@ -155,32 +221,28 @@ class TestUserRepository:
             mock_db_session.reset_mock()
             
             # 模拟结果
-            count_result = MagicMock()
-            count_result.scalar.return_value = 0
             list_result = MagicMock()
-            list_result.scalars.return_value.all.return_value = []
-            mock_db_session.execute.side_effect = [count_result, list_result]
+            list_result.all.return_value = []
+            mock_db_session.execute.return_value = list_result
 
             # 执行测试
             await user_repository.get_list(case["page"], case["page_size"])
 
             # 验证offset计算
-            list_call = mock_db_session.execute.call_args_list[1][0][0]
+            list_call = mock_db_session.execute.call_args_list[0][0][0]
             # 这里我们验证方法被调用，具体的offset计算在SQLAlchemy内部处理
 
     @pytest.mark.asyncio
     async def test_get_list_empty_result(self, user_repository, mock_db_session):
         """测试空结果查询"""
-        count_result = MagicMock()
-        count_result.scalar.return_value = 0
         list_result = MagicMock()
-        list_result.scalars.return_value.all.return_value = []
-        mock_db_session.execute.side_effect = [count_result, list_result]
+        list_result.all.return_value = []
+        mock_db_session.execute.return_value = list_result
 
-        items, total = await user_repository.get_list(page=1, page_size=10)
+        items, has_more = await user_repository.get_list(page=1, page_size=10)
 
         assert items == []
-        assert total == 0
+        assert has_more is False
 
     @pytest.mark.asyncio
     async def test_create_user(self, user_repository, mock_db_session, mock_user):
@@ -195,9 +257,43 @@ class TestUserRepository:
         # 验证操作
         mock_db_session.add.assert_called_once_with(mock_user)
         mock_db_session.commit.assert_called_once()
-        mock_db_session.refresh.assert_called_once_with(mock_user)
+        # 服务端默认值在插入时取回，不再额外 refresh
+        mock_db_session.refresh.assert_not_called()
         assert result == mock_user
 
+    @pytest.mark.asyncio
+    async def test_create_user_duplicate_rolls_back(self, user_repository, mock_db_session, mock_user):
+        """测试创建用户触发唯一索引冲突时回滚并识别冲突字段"""
+        error = IntegrityError(
+            "INSERT", {}, Exception("Duplicate entry 'a@b.com' for key 'sys_users.ix_sys_users_email'")
+        )
+        mock_db_session.add = MagicMock()
+        mock_db_session.commit = AsyncMock(side_effect=error)
+        mock_db_session.rollback = AsyncMock()
+
+        with pytest.raises(IntegrityError) as exc_info:
+            await user_repository.create(mock_user)
+
+        mock_db_session.rollback.assert_awaited_once()
+        assert UserRepository.duplicate_field(exc_info.value) == "email"
+
+    @pytest.mark.parametrize(
+        "message, field",
+        [
+            ("(1062, \"Duplicate entry 'user_name@x.com' for key 'sys_users.ix_sys_users_email'\")", "email"),
+            ("Duplicate entry 'email' for key 'ix_sys_users_user_name'", "user_name"),
+            ("UNIQUE constraint failed: sys_users.email", "email"),
+            ("UNIQUE constraint failed: sys_users.user_name", "user_name"),
+            ("NOT NULL constraint failed: sys_users.user_name", None),
+            ("(1452, 'Cannot add or update a child row: email user_name')", None),
+        ],
+    )
+    def test_duplicate_field_parses_key_name(self, message, field):
+        """测试只根据索引/列名判断冲突字段，冲突值中包含其他字段名时不误判"""
+        error = IntegrityError("INSERT", {}, Exception(message))
+
+        assert UserRepository.duplicate_field(error) == field
+
     @pytest.mark.asyncio
     async def test_update_user(self, user_repository, mock_db_session, mock_user):
         """测试更新用户"""
@@ -208,33 +304,65 @@ class TestUserRepository:
         updated_user.full_name = "Updated Name"
         updated_user.email = "updated@example.com"
 
-        # 模拟get_by_id返回更新后的用户
-        with patch.object(user_repository, 'get_by_id', return_value=updated_user):
+        # 模拟 UPDATE ... RETURNING 返回更新后的用户
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = updated_user
+        mock_db_session.execute.return_value = mock_result
+
+        with patch.object(user_repository, 'get_by_id') as mock_get_by_id:
             result = await user_repository.update(1, update_data)
 
-        # 验证结果
+        # 验证结果：一次执行完成更新与回读，不再额外查询
         mock_db_session.execute.assert_called_once()
         mock_db_session.commit.assert_called_once()
+        mock_get_by_id.assert_not_called()
         assert result.full_name == "Updated Name"
         assert result.email == "updated@example.com"
 
+    @pytest.mark.asyncio
+    async def test_update_user_without_returning(self, user_repository, mock_db_session):
+        """测试数据库不支持 RETURNING 时（MySQL）更新后回读用户"""
+        mock_db_session.get_bind.return_value.dialect.update_returning = False
+        updated_user = UserFactory.create_user_model(id=1, full_name="Updated Name")
+
+        with patch.object(user_repository, 'get_by_id', return_value=updated_user):
+            result = await user_repository.update(1, {"full_name": "Updated Name"})
+
+        mock_db_session.execute.assert_called_once()
+        mock_db_session.commit.assert_called_once()
+        assert result.full_name == "Updated Name"
+
     @pytest.mark.asyncio
     async def test_update_nonexistent_user(self, user_repository, mock_db_session):
         """测试更新不存在的用户"""
         update_data = {"full_name": "Updated Name"}
         
-        # 模拟get_by_id返回None
-        with patch.object(user_repository, 'get_by_id', return_value=None):
-            result = await user_repository.update(999, update_data)
+        # 模拟没有行被更新
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db_session.execute.return_value = mock_result
+
+        result = await user_repository.update(999, update_data)
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_update_deleted_user_returns_none(self, user_repository, mock_db_session):
+        """测试更新已软删除的用户返回None（与 get_by_id 一致）"""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = UserFactory.create_user_model(is_deleted=True)
+        mock_db_session.execute.return_value = mock_result
+
+        result = await user_repository.update(1, {"full_name": "Updated Name"})
 
         assert result is None
 
     @pytest.mark.asyncio
     async def test_delete_user_success(self, user_repository, mock_db_session):
         """测试成功删除用户（软删除）"""
-        # 模拟数据库执行结果
+        # 模拟 UPDATE ... RETURNING 返回被删除的用户ID
         mock_result = MagicMock()
-        mock_result.rowcount = 1
+        mock_result.scalar_one_or_none.return_value = 1
         mock_db_session.execute.return_value = mock_result
         mock_db_session.commit = AsyncMock()
 
@@ -245,12 +373,23 @@ class TestUserRepository:
         mock_db_session.execute.assert_called_once()
         mock_db_session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_delete_user_without_returning(self, user_repository, mock_db_session):
+        """测试数据库不支持 RETURNING 时（MySQL）按影响行数判断删除结果"""
+        mock_db_session.get_bind.return_value.dialect.update_returning = False
+        mock_db_session.execute.return_value = MagicMock(rowcount=0)
+
+        result = await user_repository.delete(999)
+
+        assert result is False
+        mock_db_session.execute.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_delete_nonexistent_user(self, user_repository, mock_db_session):
         """测试删除不存在的用户"""
         # 模拟数据库执行结果（没有行被更新）
         mock_result = MagicMock()
-        mock_result.rowcount = 0
+        mock_result.scalar_one_or_none.return_value = None
         mock_db_session.execute.return_value = mock_result
         mock_db_session.commit = AsyncMock()
 
@@ -303,16 +442,14 @@ class TestUserRepository:
         """测试用户列表排序"""
         mock_users = [UserFactory.create_user_model(id=i) for i in range(5, 0, -1)]
         
-        count_result = MagicMock()
-        count_result.scalar.return_value = 5
         list_result = MagicMock()
-        list_result.scalars.return_value.all.return_value = mock_users
-        mock_db_session.execute.side_effect = [count_result, list_result]
+        list_result.all.return_value = mock_users
+        mock_db_session.execute.return_value = list_result
 
         await user_repository.get_list(page=1, page_size=10)
 
         # 验证排序（应该是按id降序）
-        list_call = mock_db_session.execute.call_args_list[1][0][0]
+        list_call = mock_db_session.execute.call_args_list[0][0][0]
         # 验证包含order_by子句
         
     @pytest.mark.asyncio
@@ -327,9 +464,11 @@ class TestUserRepository:
         mock_db_session.add.assert_called_once()
         
         # 测试update
-        with patch.object(user_repository, 'get_by_id', return_value=mock_user):
-            await user_repository.update(1, {})
-            mock_db_session.commit.assert_called()
+        mock_db_session.execute.return_value = MagicMock(
+            scalar_one_or_none=MagicMock(return_value=mock_user)
+        )
+        await user_repository.update(1, {})
+        mock_db_session.commit.assert_called()
         
         # 测试delete
         mock_db_session.execute.reset_mock()
@@ -0,0 +1,58 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from pydantic import ValidationError
+from app.schemas.log_schema import LogCleanupByTime, SysLogOut
+
+
+class TestLogCleanupByTimeValidation:
+    """按时间清理日志请求验证测试类"""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("2025-12-29 21:45:06", datetime(2025, 12, 29, 21, 45, 6)),
+            ("2025-12-29T21:45:06", datetime(2025, 12, 29, 21, 45, 6)),
+            ("2025-12-29 21:45:06.123", datetime(2025, 12, 29, 21, 45, 6, 123000)),
+            ("2025-12-29T21:45:06.123", datetime(2025, 12, 29, 21, 45, 6, 123000)),
+        ],
+    )
+    def test_supported_formats(self, value, expected):
+        """测试支持的时间格式"""
+        data = LogCleanupByTime(start_time=value, end_time=value)
+
+        assert data.start_time == expected
+        assert data.end_time == expected
+
+    def test_invalid_format(self):
+        """测试无法解析的时间格式"""
+        with pytest.raises(ValidationError) as exc_info:
+            LogCleanupByTime(start_time="2025/12/29 21:45:06", end_time="2025-12-29 21:45:06")
+
+        assert "时间格式错误" in str(exc_info.value)
+
+
+class TestSysLogOutSerialization:
+    """日志输出序列化测试类"""
+
+    @pytest.mark.parametrize(
+        "request_time",
+        [
+            datetime(2025, 12, 29, 21, 45, 6, 123456),
+            datetime(2025, 12, 29, 21, 45, 6, tzinfo=timezone(timedelta(hours=8))),
+        ],
+    )
+    def test_datetime_fields_formatted(self, request_time):
+        """测试时间字段输出为 YYYY-MM-DD HH:mm:ss"""
+        log = SysLogOut(
+            id=1,
+            request_url="/api/users",
+            request_method="GET",
+            operation_status="success",
+            response_status="success",
+            request_time=request_time,
+        )
+
+        data = log.model_dump(by_alias=True)
+
+        assert data["requestTime"] == "2025-12-29 21:45:06"
+        assert data["createdAt"] == "2025-12-29 21:45:06"
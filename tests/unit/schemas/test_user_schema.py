@@ -71,5 +71,40 @@ class TestUserSchemaValidation:
         assert "用户名长度不能少于 3 个字符" in str(exc_info.value)
 
 
+
+class TestUserOutPermission:
+    """用户输出权限屏蔽测试"""
+
+    @staticmethod
+    def _user(user_id, user_type=9):
+        from datetime import datetime
+        from types import SimpleNamespace
+
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        return SimpleNamespace(
+            user_id=user_id,
+            user_name=f"user{user_id}",
+            email=f"user{user_id}@example.com",
+            full_name=None,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+            user_type=user_type,
+        )
+
+    def test_fast_and_masked_match_permission_output(self):
+        """测试快速输出与逐条权限判断结果一致"""
+        from app.schemas.user_schema import UserOut
+
+        admin = self._user(1, user_type=1)
+        viewer = self._user(2)
+        targets = [admin, viewer, self._user(3)]
+
+        for target in targets:
+            assert UserOut.from_user_fast(target) == UserOut.from_user_with_permission(target, admin)
+            assert UserOut.from_user_masked(target, viewer.user_id) == \
+                UserOut.from_user_with_permission(target, viewer)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
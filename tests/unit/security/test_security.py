@@ -10,6 +10,8 @@ from app.core.security import (
     create_refresh_token,
     decode_token,
     verify_password,
+    verify_password_async,
+    verify_password_cached,
 )
 
 
@@ -26,6 +28,37 @@ class TestPasswordVerification:
         # 这里主要测试函数调用的正确性
         assert callable(verify_password)
 
+    def test_verify_password_cached_only_caches_success(self):
+        """测试密码验证缓存只缓存成功结果"""
+        from passlib.hash import pbkdf2_sha256
+        from app.core import security
+
+        hashed_password = pbkdf2_sha256.hash("Test@123")
+        security._verify_cache.clear()
+
+        assert verify_password_cached("Wrong@123", hashed_password) is False
+        assert len(security._verify_cache) == 0
+
+        assert verify_password_cached("Test@123", hashed_password) is True
+        assert len(security._verify_cache) == 1
+        assert verify_password_cached("Test@123", hashed_password) is True
+
+    @pytest.mark.asyncio
+    async def test_verify_password_async_shares_cache(self):
+        """测试异步密码验证与同步缓存版本共用缓存"""
+        from passlib.hash import pbkdf2_sha256
+        from app.core import security
+
+        hashed_password = pbkdf2_sha256.hash("Test@123")
+        security._verify_cache.clear()
+
+        assert await verify_password_async("Wrong@123", hashed_password) is False
+        assert len(security._verify_cache) == 0
+
+        assert await verify_password_async("Test@123", hashed_password) is True
+        assert verify_password_cached("Test@123", hashed_password) is True
+        assert len(security._verify_cache) == 1
+
 
 class TestTokenCreation:
     """Token创建测试"""
@@ -61,6 +94,17 @@ class TestTokenCreation:
         assert isinstance(token, str)
         assert len(token) > 0
 
+    def test_create_token_matches_jose_encoding(self):
+        """测试HS256快速签名结果与jose编码一致"""
+        from jose import jwt
+        from app.core.config import settings
+
+        token = create_access_token(data={"sub": "1"})
+        payload = decode_token(token)
+        expected = jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+        assert token == expected
+
 
 class TestTokenDecoding:
     """Token解码测试"""
@@ -102,6 +146,19 @@ class TestTokenDecoding:
         assert exc_info.value.status_code == 401
 
 
+
+class TestAuthDependencies:
+    """认证依赖测试"""
+
+    def test_auth_dependencies_are_coroutines(self):
+        """测试认证依赖为协程函数（FastAPI直接await，不进入线程池）"""
+        import inspect
+        from app.core.security import get_current_active_user, get_current_user
+
+        assert inspect.iscoroutinefunction(get_current_user)
+        assert inspect.iscoroutinefunction(get_current_active_user)
+
+
 @pytest.mark.asyncio
 class TestLoginEndpoint:
     """登录接口测试（集成测试）"""
@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.user_service import UserService
 from app.schemas.user_schema import UserCreate, UserUpdate
@@ -58,15 +59,80 @@ class TestUserService:
             "page_size": 10,
             "total_page": 1
         }
-        user_service.repo.get_list = AsyncMock(return_value=([sample_user], 1))
+        user_service.repo.get_list_with_total = AsyncMock(return_value=([sample_user], 1))
         
-        result = await user_service.list_users(1, 10)
+        result = await user_service.list_users(1, 10, with_count=True)
         
         assert result["records"] == [sample_user]
         assert result["total"] == 1
         assert result["page"] == 1
         assert result["page_size"] == 10
         assert result["total_page"] == 1
+        assert result["has_more"] is False
+
+    @pytest.mark.asyncio
+    async def test_list_users_countless_skips_count(self, user_service, sample_user):
+        """测试默认不查询总数，仅返回是否还有下一页"""
+        user_service.repo.get_list = AsyncMock(return_value=([sample_user], True))
+        user_service.repo.get_list_with_total = AsyncMock()
+
+        result = await user_service.list_users(1, 1)
+
+        assert result["records"] == [sample_user]
+        assert result["has_more"] is True
+        assert result["total"] is None
+        assert result["total_page"] is None
+        user_service.repo.get_list_with_total.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_list_users_uses_estimate_after_first_page(self, user_service):
+        """测试非首页的总数优先使用估算值，首页始终精确统计"""
+        user_service.repo.get_list = AsyncMock(return_value=([], True))
+        user_service.repo.approx_count = AsyncMock(return_value=200_000)
+        user_service.repo.get_list_with_total = AsyncMock(return_value=([], 199_990))
+
+        page2 = await user_service.list_users(2, 10, with_count=True)
+        page1 = await user_service.list_users(1, 10, with_count=True)
+
+        assert page2["total"] == 200_000
+        assert page2["total_approx"] is True
+        assert page1["total"] == 199_990
+        assert page1["total_approx"] is False
+        user_service.repo.approx_count.assert_awaited_once()
+        user_service.repo.get_list.assert_awaited_once()
+        user_service.repo.get_list_with_total.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_list_users_by_cursor(self, user_service, sample_user):
+        """测试游标分页：游标在服务层编解码，仓储层只接收用户ID"""
+        user_service.repo.get_list_keyset = AsyncMock(return_value=([sample_user], 41))
+
+        token = UserService._encode_cursor(42)
+        result = await user_service.list_users_by_cursor(token, 1)
+
+        assert result["records"] == [sample_user]
+        assert UserService._decode_cursor(result["next_cursor"]) == 41
+        user_service.repo.get_list_keyset.assert_awaited_once_with(42, 1, None)
+
+    def test_list_users_by_cursor_invalid(self, user_service):
+        """测试无效游标"""
+        with pytest.raises(AppError) as exc_info:
+            UserService._decode_cursor("not-a-cursor")
+
+        assert "分页游标无效" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_list_users_non_admin_never_uses_estimate(self, user_service):
+        """测试普通用户的列表过滤了管理员，总数始终精确统计"""
+        normal = Mock(user_id=5, user_type=9)
+        user_service.repo.approx_count = AsyncMock(return_value=200_000)
+        user_service.repo.get_list_with_total = AsyncMock(return_value=([], 199_000))
+
+        result = await user_service.list_users(2, 10, normal, with_count=True)
+
+        assert result["total"] == 199_000
+        assert result["total_approx"] is False
+        user_service.repo.approx_count.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_list_users_edge_cases(self, user_service):
@@ -78,9 +144,9 @@ class TestUserService:
         ]
         
         for case in test_cases:
-            user_service.repo.get_list = AsyncMock(return_value=([], 0))
+            user_service.repo.get_list_with_total = AsyncMock(return_value=([], 0))
             
-            result = await user_service.list_users(case["page"], case["page_size"])
+            result = await user_service.list_users(case["page"], case["page_size"], with_count=True)
             
             assert result["page"] == case["page"]
             assert result["page_size"] == case["page_size"]
@@ -89,8 +155,6 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_create_user_success(self, user_service, sample_user):
         """测试成功创建用户"""
-        user_service.repo.get_by_user_name = AsyncMock(return_value=None)
-        user_service.repo.get_by_email = AsyncMock(return_value=None)
         user_service.repo.create = AsyncMock(return_value=sample_user)
         
         user_data = UserCreate(
@@ -102,14 +166,14 @@ class TestUserService:
         result = await user_service.create_user(user_data)
         
         assert result == sample_user
-        user_service.repo.get_by_user_name.assert_called_once_with("testuser")
-        user_service.repo.get_by_email.assert_called_once_with("test@example.com")
         user_service.repo.create.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_create_user_duplicate_username(self, user_service, sample_user):
         """测试创建用户时用户名重复"""
-        user_service.repo.get_by_user_name = AsyncMock(return_value=sample_user)
+        user_service.repo.create = AsyncMock(side_effect=IntegrityError(
+            "INSERT", {}, Exception("UNIQUE constraint failed: sys_users.user_name")
+        ))
         
         user_data = UserCreate(
             user_name="existinguser",
@@ -125,8 +189,9 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_create_user_duplicate_email(self, user_service, sample_user):
         """测试创建用户时邮箱重复"""
-        user_service.repo.get_by_user_name = AsyncMock(return_value=None)
-        user_service.repo.get_by_email = AsyncMock(return_value=sample_user)
+        user_service.repo.create = AsyncMock(side_effect=IntegrityError(
+            "INSERT", {}, Exception("UNIQUE constraint failed: sys_users.email")
+        ))
         
         user_data = UserCreate(
             user_name="newuser",
@@ -142,7 +207,6 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_create_user_without_email(self, user_service, sample_user):
         """测试创建用户时不提供邮箱"""
-        user_service.repo.get_by_user_name = AsyncMock(return_value=None)
         user_service.repo.create = AsyncMock(return_value=sample_user)
         
         user_data = UserCreate(
@@ -154,12 +218,12 @@ class TestUserService:
         result = await user_service.create_user(user_data)
         
         assert result == sample_user
-        user_service.repo.get_by_email.assert_not_called()
+        user_service.repo.create.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_update_user_success(self, user_service, sample_user):
         """测试成功更新用户"""
-        user_service.repo.get_by_id = AsyncMock(return_value=sample_user)
+        user_service.repo.exists = AsyncMock(return_value=True)
         user_service.repo.update = AsyncMock(return_value=sample_user)
         
         update_data = UserUpdate(
@@ -170,13 +234,13 @@ class TestUserService:
         result = await user_service.update_user(1, update_data)
         
         assert result == sample_user
-        user_service.repo.get_by_id.assert_called_once_with(1)
+        user_service.repo.exists.assert_called_once_with(1)
         user_service.repo.update.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_update_user_not_found(self, user_service):
         """测试更新不存在的用户"""
-        user_service.repo.get_by_id = AsyncMock(return_value=None)
+        user_service.repo.exists = AsyncMock(return_value=False)
         
         update_data = UserUpdate(full_name="New Name")
         
@@ -188,7 +252,7 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_update_user_partial_update(self, user_service, sample_user):
         """测试用户部分更新"""
-        user_service.repo.get_by_id = AsyncMock(return_value=sample_user)
+        user_service.repo.exists = AsyncMock(return_value=True)
         user_service.repo.update = AsyncMock(return_value=sample_user)
         
         # 只更新邮箱
@@ -204,7 +268,7 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_update_user_no_changes(self, user_service, sample_user):
         """测试用户无更新"""
-        user_service.repo.get_by_id = AsyncMock(return_value=sample_user)
+        user_service.repo.exists = AsyncMock(return_value=True)
         user_service.repo.update = AsyncMock(return_value=sample_user)
         
         # 空更新数据
@@ -220,7 +284,7 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_update_user_failure(self, user_service, sample_user):
         """测试用户更新失败"""
-        user_service.repo.get_by_id = AsyncMock(return_value=sample_user)
+        user_service.repo.exists = AsyncMock(return_value=True)
         user_service.repo.update = AsyncMock(return_value=None)
         
         update_data = UserUpdate(full_name="New Name")
@@ -242,6 +306,36 @@ class TestUserService:
         user_service.repo.get_by_id.assert_called_once_with(1)
         user_service.repo.delete.assert_called_once_with(1)
 
+    @pytest.mark.asyncio
+    async def test_get_user_memoized_within_request(self, user_service):
+        """测试同一服务实例（同一请求）内重复获取用户只查询一次，删除后失效"""
+        target = Mock(user_id=2, user_name="target")
+        admin = Mock(user_id=1, user_type=1)
+        user_service.repo.get_by_id = AsyncMock(return_value=target)
+        user_service.repo.delete = AsyncMock(return_value=True)
+
+        assert await user_service.can_delete_user(admin, 2) is True
+        await user_service.delete_user(2)
+        user_service.repo.get_by_id.assert_awaited_once_with(2)
+
+        await user_service.get_user(2)
+        assert user_service.repo.get_by_id.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_update_user_reuses_user_loaded_by_permission_check(self, user_service):
+        """测试权限校验已加载目标用户时，更新不再单独查询存在性"""
+        target = Mock(user_id=2, user_type=9, user_name="target")
+        admin = Mock(user_id=1, user_type=1)
+        user_service.repo.get_by_id = AsyncMock(return_value=target)
+        user_service.repo.exists = AsyncMock(return_value=True)
+        user_service.repo.update = AsyncMock(return_value=target)
+
+        assert await user_service.can_update_user(admin, 2) is True
+        await user_service.update_user(2, UserUpdate(full_name="New Name"))
+
+        user_service.repo.get_by_id.assert_awaited_once_with(2)
+        user_service.repo.exists.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_delete_user_not_found(self, user_service):
         """测试删除不存在的用户"""
@@ -328,8 +422,6 @@ class TestUserService:
         import asyncio
         
         # 模拟repository方法
-        user_service.repo.get_by_user_name = AsyncMock(return_value=None)
-        user_service.repo.get_by_email = AsyncMock(return_value=None)
         user_service.repo.create = AsyncMock(return_value=Mock())
         
         async def create_user_task(user_name):
@@ -351,8 +443,6 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_transaction_rollback_on_create_failure(self, user_service):
         """测试创建用户失败时事务回滚"""
-        user_service.repo.get_by_user_name = AsyncMock(return_value=None)
-        user_service.repo.get_by_email = AsyncMock(return_value=None)
         user_service.repo.create = AsyncMock(side_effect=Exception("Database error"))
         
         user_data = UserCreate(
@@ -392,9 +482,9 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_list_users_empty_result(self, user_service):
         """测试空用户列表"""
-        user_service.repo.get_list = AsyncMock(return_value=([], 0))
+        user_service.repo.get_list_with_total = AsyncMock(return_value=([], 0))
         
-        result = await user_service.list_users(1, 10)
+        result = await user_service.list_users(1, 10, with_count=True)
         
         assert result["records"] == []
         assert result["total"] == 0
@@ -405,9 +495,9 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_list_users_large_page_size(self, user_service, sample_user):
         """测试大分页大小"""
-        user_service.repo.get_list = AsyncMock(return_value=([sample_user], 1))
+        user_service.repo.get_list_with_total = AsyncMock(return_value=([sample_user], 1))
         
-        result = await user_service.list_users(1, 1000)
+        result = await user_service.list_users(1, 1000, with_count=True)
         
         assert result["page_size"] == 1000
         assert result["total_page"] == 1
@@ -415,7 +505,7 @@ class TestUserService:
     @pytest.mark.asyncio
     async def test_update_user_with_none_values(self, user_service, sample_user):
         """测试更新用户时包含None值"""
-        user_service.repo.get_by_id = AsyncMock(return_value=sample_user)
+        user_service.repo.exists = AsyncMock(return_value=True)
         user_service.repo.update = AsyncMock(return_value=sample_user)
         
         # 更新数据包含None值
@@ -465,8 +555,6 @@ class TestUserService:
     async def test_create_user_with_password_validation(self, user_service, mock_db):
         """测试创建用户时的密码验证"""
         # 模拟repository方法
-        user_service.repo.get_by_user_name = AsyncMock(return_value=None)
-        user_service.repo.get_by_email = AsyncMock(return_value=None)
         user_service.repo.create = AsyncMock(return_value=Mock())
 
         # 测试有效密码